@@ -1,8 +1,10 @@
+from .access_log import AccessLogAggregator
 from .cancellation_context import (
     CancellationContext,
     CancellationContextDep,
     get_cancellation_context,
 )
+from .compression_middleware import CompressionMiddleware, accepted_encodings
 from .configuration import AppSettings, Settings, get_configuration
 from .exceptions import (
     ApplicationException,
@@ -14,18 +16,22 @@ from .exceptions import (
     UnprocessableEntityException,
 )
 from .httpx import HttpService
-from .openapi import responses_model
+from .openapi import dedupe_openapi_responses, responses_model
 from .request_trace_middleware import RequestTraceMiddleware
 
 __all__ = [
+    "AccessLogAggregator",
     "CancellationContext",
     "get_cancellation_context",
     "CancellationContextDep",
+    "CompressionMiddleware",
+    "accepted_encodings",
     "AppSettings",
     "get_configuration",
     "Settings",
     "HttpService",
     "responses_model",
+    "dedupe_openapi_responses",
     "RequestTraceMiddleware",
     "ExceptionSeverity",
     "ApplicationException",
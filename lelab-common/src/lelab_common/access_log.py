@@ -0,0 +1,76 @@
+import logging
+import random
+from dataclasses import dataclass, field
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _RouteStats:
+    count: int = 0
+    samples: list[int] = field(default_factory=list)
+
+
+def _percentile(sorted_samples: list[int], percentile: float) -> int:
+    """Nearest-rank percentile of an already sorted, non-empty sample list."""
+    index = max(0, int(round(percentile / 100 * len(sorted_samples))) - 1)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
+class AccessLogAggregator:
+    """
+    Aggregates request latencies per route and status and periodically logs a summary.
+
+    Used by ``RequestTraceMiddleware`` to replace per-request access log lines with one
+    line per (method, route, status) every ``interval`` seconds. Latencies are kept in a
+    bounded reservoir per key, so memory stays constant regardless of request volume.
+    The summary is flushed lazily by the first request recorded after the interval
+    elapses, so no background task is required.
+    """
+
+    def __init__(self, interval: float = 60.0, max_samples: int = 2048):
+        self.interval = interval
+        self.max_samples = max_samples
+        self._stats: dict[tuple[str, str, int], _RouteStats] = {}
+        self._next_flush = monotonic() + interval
+
+    def record(self, method: str, route: str, status_code: int, duration_ms: int) -> None:
+        """Record a single request and flush the summary when the interval has elapsed."""
+        key = (method, route, status_code)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _RouteStats()
+
+        stats.count += 1
+        if len(stats.samples) < self.max_samples:
+            stats.samples.append(duration_ms)
+        else:
+            # Reservoir sampling keeps a uniform sample of all requests in the interval
+            slot = random.randrange(stats.count)
+            if slot < self.max_samples:
+                stats.samples[slot] = duration_ms
+
+        if monotonic() >= self._next_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Log the aggregated summary for the current interval and start a new one."""
+        stats, self._stats = self._stats, {}
+        self._next_flush = monotonic() + self.interval
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        for (method, route, status_code), route_stats in sorted(stats.items()):
+            samples = sorted(route_stats.samples)
+            logger.info(
+                "Access summary - %s %s - %s - count: %d, p50: %dms, p95: %dms, p99: %dms",
+                method,
+                route,
+                status_code,
+                route_stats.count,
+                _percentile(samples, 50),
+                _percentile(samples, 95),
+                _percentile(samples, 99),
+            )
@@ -0,0 +1,250 @@
+import zlib
+from typing import Callable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # pyright: ignore[reportMissingImports]
+except ImportError:  # Brotli is optional
+    brotli = None
+
+try:
+    import zstandard  # pyright: ignore[reportMissingImports]
+except ImportError:  # Zstandard is optional
+    zstandard = None
+
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+)
+
+
+class _StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _ZlibCompressor:
+    def __init__(self, level: int):
+        # wbits=31 writes the gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _available_encodings(
+    gzip_level: int, brotli_quality: int, zstd_level: int
+) -> dict[str, Callable[[], _StreamCompressor]]:
+    """Supported encodings in server preference order."""
+    encodings: dict[str, Callable[[], _StreamCompressor]] = {}
+    if brotli is not None:
+        encodings["br"] = lambda: _BrotliCompressor(brotli_quality)
+    if zstandard is not None:
+        encodings["zstd"] = lambda: _ZstdCompressor(zstd_level)
+    encodings["gzip"] = lambda: _ZlibCompressor(gzip_level)
+    return encodings
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Content codings accepted by an ``Accept-Encoding`` header value.
+
+    Codings with ``q=0`` or an invalid quality are left out, the others are lower-cased.
+
+    Args:
+        accept_encoding: Raw header value, e.g. ``"br;q=1.0, gzip, identity;q=0"``
+
+    Returns:
+        Accepted codings, e.g. ``{"br", "gzip"}``
+    """
+    accepted: set[str] = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli, zstd or gzip.
+
+    The encoding is negotiated from ``Accept-Encoding``, preferring brotli, then zstd,
+    then gzip; brotli and zstd are used only when the ``brotli`` and ``zstandard``
+    packages are installed.
+
+    Responses are left untouched when they:
+    - already carry a ``Content-Encoding`` (e.g. precompressed static files)
+    - have a content type outside ``compressible_types``
+    - are smaller than ``minimum_size`` when sent in a single body message
+    - are marked ``Cache-Control: no-transform``
+
+    Streaming responses are compressed chunk by chunk and flushed after each chunk,
+    so clients keep receiving data as it is produced.
+
+    Args:
+        app: Wrapped ASGI application
+        minimum_size: Responses smaller than this many bytes are sent uncompressed
+        compressible_types: Content type prefixes that may be compressed
+        gzip_level: zlib compression level
+        brotli_quality: Brotli quality, lower is faster
+        zstd_level: Zstandard compression level
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compressible_types: tuple[str, ...] = DEFAULT_COMPRESSIBLE_TYPES,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressible_types = compressible_types
+        self._encodings = _available_encodings(gzip_level, brotli_quality, zstd_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        encoding = self._negotiate(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, accept_encoding: str) -> str | None:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in self._encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        return headers.get("content-type", "").startswith(self.compressible_types)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper deciding on the first body message whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start_message: Message | None = None
+        self._start_headers: MutableHeaders | None = None
+        self._compressor: _StreamCompressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = MutableHeaders(raw=list(message.get("headers", [])))
+            headers.add_vary_header("Accept-Encoding")
+            message["headers"] = headers.raw
+            status_code = message["status"]
+            if status_code < 200 or status_code in (204, 304) or not self.middleware._is_compressible(headers):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                # Hold the start message until the first body chunk tells us the response size
+                self._start_message = message
+                self._start_headers = headers
+            return
+
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        start_message, headers = self._start_message, self._start_headers
+        if start_message is not None and headers is not None:
+            self._start_message = self._start_headers = None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self._passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            self._compressor = self.middleware._encodings[self.encoding]()
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed = self._compressor.compress(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(start_message)
+
+        compressor = self._compressor
+        if compressor is None:
+            await self._send(message)
+            return
+        if more_body:
+            chunk = compressor.compress(body) + compressor.flush()
+        else:
+            chunk = compressor.compress(body) + compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -16,6 +16,7 @@ class ApplicationException(Exception):
     message: str = "The requested operation failed"
     debug: str = "An unknown and unhandled exception occurred in the API"
     extra: dict[str, Any] | None = None
+    headers: dict[str, str] | None = None
 
     @property
     def type(self) -> str:
@@ -28,12 +29,14 @@ class ApplicationException(Exception):
         extra: dict[str, Any] | None = None,
         status: int = 500,
         severity: ExceptionSeverity = ExceptionSeverity.ERROR,
+        headers: dict[str, str] | None = None,
     ):
         self.status = status
         self.message = message
         self.debug = debug
         self.extra = extra
         self.severity = severity
+        self.headers = headers
 
     def to_dict(self) -> dict[str, int | str | dict[str, Any] | None]:
         return {
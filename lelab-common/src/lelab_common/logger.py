@@ -1,21 +1,70 @@
+import copy
+import json
 import logging
 import os
+import queue
 import sys
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Any, Callable, Literal
 from zoneinfo import ZoneInfo
 
+from .request_trace_middleware import current_trace_id
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is optional for lelab_common consumers
+    otel_trace = None  # type: ignore[assignment]
+
+_json_dumps: Callable[[dict[str, Any]], str]
+try:
+    import orjson
+
+    def _json_dumps(obj: dict[str, Any]) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+except ImportError:
+    try:
+        import ujson
+
+        def _json_dumps(obj: dict[str, Any]) -> str:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=str)
+
+    except ImportError:
+        _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+        _json_dumps = _json_encoder.encode
+
+QueueFullPolicy = Literal["drop", "block"]
+LogFormat = Literal["text", "json"]
+
+_exception_formatter = logging.Formatter()
+
+_queue_listener: QueueListener | None = None
+
 
 class ISO8601Formatter(logging.Formatter):
     """
     Formatter that uses ISO8601 date format with time zone support.
+
+    The time zone is resolved from ``TZ`` once per formatter. The date, time and offset
+    are rendered once per second and cached; each record only splices in its milliseconds.
     """
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._tz = ZoneInfo(os.environ.get("TZ", "UTC"))
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS", "+HH:MM"), swapped as one tuple for thread safety
+        self._second_cache: tuple[int, str, str] = (-1, "", "")
+
     def formatTime(self, record, datefmt=None):
-        tz_name = os.environ.get("TZ", "UTC")
-        dt = datetime.fromtimestamp(record.created, tz=ZoneInfo(tz_name))
-        return dt.isoformat()
+        second = int(record.created)
+        cached_second, prefix, offset = self._second_cache
+        if second != cached_second:
+            iso = datetime.fromtimestamp(second, tz=self._tz).isoformat()
+            prefix, offset = iso[:19], iso[19:]
+            self._second_cache = (second, prefix, offset)
+        return f"{prefix}.{int(record.msecs):03d}{offset}"
 
 
 class ColoredISO8601Formatter(ISO8601Formatter):
@@ -28,19 +77,121 @@ class ColoredISO8601Formatter(ISO8601Formatter):
     }
     RESET = "\033[0m"
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Per-level copies of the format with the colored level name baked in, so records are never mutated
+        self._level_styles: dict[str, logging.PercentStyle] = {}
+        if type(self._style) is logging.PercentStyle and "%(levelname)s" in self._style._fmt:
+            for levelname, color in self.COLORS.items():
+                colored_fmt = self._style._fmt.replace("%(levelname)s", f"{color}{levelname}{self.RESET}")
+                self._level_styles[levelname] = logging.PercentStyle(colored_fmt, defaults=self._style._defaults)
+
+    def formatMessage(self, record):
+        return self._level_styles.get(record.levelname, self._style).format(record)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Stamps records with ``trace_id`` and ``span_id`` of the current request.
+
+    The trace ID comes from ``RequestTraceMiddleware`` and falls back to the active
+    OpenTelemetry span. The filter runs on the emitting thread, so the IDs survive
+    hand-off to the async logging queue.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = current_trace_id.get()
+        span_id = None
+        if otel_trace is not None:
+            span_context = otel_trace.get_current_span().get_span_context()
+            if span_context.is_valid:
+                span_id = format(span_context.span_id, "016x")
+                if trace_id is None:
+                    trace_id = format(span_context.trace_id, "032x")
+        record.trace_id = trace_id
+        record.span_id = span_id
+        return True
+
+
+class JSONFormatter(ISO8601Formatter):
+    """
+    Formatter that renders one JSON object per line for log shippers.
+
+    Keys are emitted in a fixed order: ``timestamp``, ``level``, ``logger``, ``message``,
+    ``trace_id``, ``span_id`` and, when present, ``exception``. Trace fields are read from
+    ``TraceContextFilter``; records that did not pass through it get ``null``.
+    """
+
     def format(self, record):
-        original_levelname = record.levelname
-        color = self.COLORS.get(record.levelname, "")
-        if color:
-            record.levelname = f"{color}{record.levelname}{self.RESET}"
+        payload: dict[str, Any] = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "trace_id": getattr(record, "trace_id", None),
+            "span_id": getattr(record, "span_id", None),
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return _json_dumps(payload)
+
 
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler backed by a bounded queue, so slow log sinks never stall the caller indefinitely.
+
+    When the queue is full the record is either dropped immediately (``drop``) or the caller
+    waits up to ``block_timeout`` seconds for space (``block``) before dropping it.
+    Dropped records are counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue[logging.LogRecord],
+        policy: QueueFullPolicy = "drop",
+        block_timeout: float = 1.0,
+    ):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message and render the traceback, keeping it separate from the message."""
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
         try:
-            message = super().format(record)
-        finally:
-            # Restore original levelname to avoid affecting other handlers
-            record.levelname = original_levelname
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-        return message
+
+class BoundedQueueListener(QueueListener):
+    """
+    Queue listener that can be stopped while its bounded queue is full.
+
+    ``QueueListener.stop`` enqueues its sentinel with ``put_nowait``, which raises ``queue.Full``
+    and leaves the thread running when the sinks lag behind. The sentinel is put with a blocking
+    call instead, the listener thread frees up space while draining the queue.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 def setup_logger(
@@ -49,6 +200,10 @@ def setup_logger(
     log_filename: str = "app.log",
     rotation: str = "midnight",
     retention_days: int = 7,
+    async_mode: bool = False,
+    queue_size: int = 10000,
+    queue_full_policy: QueueFullPolicy = "drop",
+    log_format: LogFormat = "text",
 ) -> logging.Logger:
     """
     Setup root logger with iso8601 datetime and return root logger instance.
@@ -59,18 +214,24 @@ def setup_logger(
         log_filename: Name of the log file (default: app.log)
         rotation: Rotation interval for TimedRotatingFileHandler (default: midnight)
         retention_days: Number of days to keep log files (default: 7)
+        async_mode: Write records from a background thread through a bounded queue (default: False)
+        queue_size: Maximum number of records buffered in async mode (default: 10000)
+        queue_full_policy: ``drop`` or ``block`` when the queue is full in async mode (default: drop)
+        log_format: ``text`` for tab-separated lines or ``json`` for one JSON object per line (default: text)
     """
+    global _queue_listener
     logger = logging.getLogger()
     logger.setLevel(log_level)
 
     # Clear existing handlers
+    shutdown_logger()
     if logger.handlers:
         logger.handlers.clear()
 
     formatter_str = "%(levelname)s:\t%(asctime)s\t[%(name)s]\t%(message)s"
 
     # Console Handler
-    console_formatter = ColoredISO8601Formatter(formatter_str)
+    console_formatter = JSONFormatter() if log_format == "json" else ColoredISO8601Formatter(formatter_str)
     channel = logging.StreamHandler(sys.stdout)
     channel.setFormatter(console_formatter)
     logger.addHandler(channel)
@@ -90,11 +251,61 @@ def setup_logger(
                 encoding="utf-8",
             )
             # Use plain ISO8601 formatter for files (no colors)
-            file_formatter = ISO8601Formatter(formatter_str)
+            file_formatter = JSONFormatter() if log_format == "json" else ISO8601Formatter(formatter_str)
             file_handler.setFormatter(file_formatter)
             logger.addHandler(file_handler)
         except Exception as e:
             # Fallback to stderr if file logging fails
             print(f"Failed to setup file logging: {e}", file=sys.stderr)
 
+    # Move the sink handlers behind a queue drained by a background thread
+    if async_mode:
+        sink_handlers = list(logger.handlers)
+        logger.handlers.clear()
+
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+        logger.addHandler(BoundedQueueHandler(log_queue, policy=queue_full_policy))
+        _queue_listener = BoundedQueueListener(log_queue, *sink_handlers, respect_handler_level=True)
+        _queue_listener.start()
+
+    # Capture trace IDs on the emitting thread, where the request context is available
+    if log_format == "json":
+        for handler in logger.handlers:
+            handler.addFilter(TraceContextFilter())
+
     return logger
+
+
+def get_dropped_log_records() -> int:
+    """Return the number of records dropped by the root logger's bounded queue handlers."""
+    return sum(handler.dropped for handler in logging.getLogger().handlers if isinstance(handler, BoundedQueueHandler))
+
+
+def shutdown_logger() -> None:
+    """
+    Stop the async logging listener, flushing queued records to the sink handlers.
+
+    The sink handlers are attached back to the root logger so records emitted afterwards
+    are still written, synchronously.
+    """
+    global _queue_listener
+    if _queue_listener is None:
+        return
+
+    _queue_listener.stop()
+    dropped = get_dropped_log_records()
+
+    logger = logging.getLogger()
+    filters: list[logging.Filter | Callable[[logging.LogRecord], bool]] = []
+    for handler in list(logger.handlers):
+        if isinstance(handler, BoundedQueueHandler):
+            filters.extend(handler.filters)
+            logger.removeHandler(handler)
+    for handler in _queue_listener.handlers:
+        for log_filter in filters:
+            handler.addFilter(log_filter)
+        logger.addHandler(handler)
+    _queue_listener = None
+
+    if dropped:
+        print(f"Async logging dropped {dropped} records because the queue was full", file=sys.stderr)
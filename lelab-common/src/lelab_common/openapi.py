@@ -1,3 +1,5 @@
+import json
+import re
 from typing import Any
 
 from pydantic import BaseModel
@@ -19,7 +21,7 @@ class ErrorResponse(BaseModel):
     extra: dict[str, Any] | None = None
 
 
-__all__ = ["responses_model"]
+__all__ = ["responses_model", "dedupe_openapi_responses"]
 
 responses_model: dict[int | str, dict[str, Any]] = {
     400: {
@@ -55,3 +57,73 @@ responses_model: dict[int | str, dict[str, Any]] = {
         "content": {"application/json": {"example": ApplicationException().to_dict()}},
     },
 }
+
+
+_HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
+
+def _response_component_name(status_code: str, response: dict[str, Any], taken: set[str]) -> str:
+    """Component name for a shared response: its example error type, or its description."""
+    example = response.get("content", {}).get("application/json", {}).get("example")
+    if isinstance(example, dict) and isinstance(example.get("type"), str):
+        base = example["type"]
+    else:
+        words = re.findall(r"[A-Za-z0-9]+", response.get("description", ""))
+        base = "".join(word[:1].upper() + word[1:] for word in words) + status_code
+    name = base
+    suffix = 2
+    while name in taken:
+        name = f"{base}{suffix}"
+        suffix += 1
+    return name
+
+
+def _is_error_status(status_code: str) -> bool:
+    return status_code[:1] in ("4", "5")
+
+
+def dedupe_openapi_responses(schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Move error responses repeated across operations to ``components/responses``.
+
+    Every operation includes the shared error responses from ``responses_model`` (and
+    FastAPI adds the same 422 validation response to each), so the document repeats
+    identical objects on every route. 4xx/5xx responses that appear more than once are
+    stored once as a component and replaced by a ``$ref``.
+
+    :param schema: OpenAPI document, modified in place.
+    :return: the same document.
+    """
+    operations: list[dict[str, Any]] = [
+        operation
+        for path_item in schema.get("paths", {}).values()
+        for method, operation in path_item.items()
+        if method in _HTTP_METHODS and isinstance(operation, dict)
+    ]
+
+    counts: dict[str, int] = {}
+    for operation in operations:
+        for status_code, response in operation.get("responses", {}).items():
+            if _is_error_status(status_code) and "$ref" not in response:
+                key = json.dumps(response, sort_keys=True)
+                counts[key] = counts.get(key, 0) + 1
+
+    components = schema.setdefault("components", {}).setdefault("responses", {})
+    refs: dict[str, str] = {}
+    for operation in operations:
+        responses = operation.get("responses", {})
+        for status_code, response in responses.items():
+            if not _is_error_status(status_code) or "$ref" in response:
+                continue
+            key = json.dumps(response, sort_keys=True)
+            if counts[key] < 2:
+                continue
+            if key not in refs:
+                name = _response_component_name(status_code, response, set(components))
+                components[name] = response
+                refs[key] = f"#/components/responses/{name}"
+            responses[status_code] = {"$ref": refs[key]}
+
+    if not components:
+        del schema["components"]["responses"]
+    return schema
@@ -1,16 +1,48 @@
 import logging
-import time
-import uuid
+from contextvars import ContextVar
+from random import getrandbits
+from time import perf_counter_ns
 
 from starlette import status
-from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse as StarletteJSONResponse
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .access_log import AccessLogAggregator
 from .exceptions import ApplicationException
 
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.metrics import get_meter
+    from opentelemetry.trace import INVALID_SPAN_ID, NonRecordingSpan, SpanContext, TraceFlags
+
+    # Proxy instrument: a no-op until the application installs a MeterProvider
+    _request_duration = get_meter(__name__).create_histogram(
+        "http.server.request.duration",
+        unit="ms",
+        description="Request latency measured by RequestTraceMiddleware",
+    )
+except ImportError:  # OpenTelemetry is optional for lelab_common consumers
+    otel_trace = None  # type: ignore[assignment]
+    _request_duration = None
+
 logger = logging.getLogger(__name__)
 
+_TRACE_HEADER = b"x-trace-id"
+
+# Trace ID of the request being handled in the current context, for log correlation
+current_trace_id: ContextVar[str | None] = ContextVar("current_trace_id", default=None)
+
+
+def _elapsed_ms(start_ns: int) -> int:
+    """Milliseconds elapsed since ``start_ns`` (a ``perf_counter_ns`` reading), rounded to an integer."""
+    return (perf_counter_ns() - start_ns + 500_000) // 1_000_000
+
+
+def _route_path(scope: Scope) -> str:
+    """Matched route template for the request, so aggregated stats do not explode per path parameter."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
 
 class RequestTraceMiddleware:
     """
@@ -18,15 +50,36 @@ class RequestTraceMiddleware:
 
     Features:
     - Integrates with OpenTelemetry trace IDs when available
-    - Falls back to UUID generation when OTEL is not configured
-    - Measures request processing time
+    - Falls back to a random 128-bit trace ID (OTEL format) when OTEL is not configured
+    - Measures request processing time (and records it as an OTEL histogram when available)
     - Adds trace_id and processing time headers to all responses
     - Handles exceptions with proper error responses
-    - Comprehensive request/response logging
+    - Request/response logging with optional sampling or periodic aggregation
+
+    Args:
+        app: Wrapped ASGI application
+        log_sample_rate: Log one in N successful requests (1 logs every request)
+        slow_request_threshold_ms: Requests slower than this are always logged
+        access_log_aggregator: When set, successful requests are aggregated into periodic
+            per-route summaries instead of being logged individually
+
+    Server errors (5xx) and unhandled exceptions are always logged.
     """
 
-    def __init__(self, app: ASGIApp):
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_sample_rate: int = 1,
+        slow_request_threshold_ms: int | None = None,
+        access_log_aggregator: AccessLogAggregator | None = None,
+    ):
         self.app = app
+        self.log_sample_rate = max(1, log_sample_rate)
+        self.slow_request_threshold_ms = slow_request_threshold_ms
+        self.access_log_aggregator = access_log_aggregator
+        # Every request gets a start/complete line pair only in the default, unsampled mode
+        self._log_request_start = self.log_sample_rate == 1 and access_log_aggregator is None
+        self._sample_counter = 0
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
@@ -34,44 +87,46 @@ class RequestTraceMiddleware:
             return
 
         # Initialize request tracking
-        start_time = time.time()
+        start_ns = perf_counter_ns()
         trace_id = self._get_trace_id_from_scope(scope)
+        trace_id_header = trace_id.encode("latin-1")
         method = scope.get("method", "UNKNOWN")
         path = scope.get("path", "unknown")
-        process_time = "0"
-        status_code = "unknown"
+        elapsed_ms = 0
+        status_code = 0
 
-        # Store trace_id in scope for access by other middleware/handlers
+        # Store trace_id in scope for access by other middleware/handlers, and in context for logging
         scope["trace_id"] = trace_id
+        trace_id_token = current_trace_id.set(trace_id)
 
         # Log the start of request with trace_id
-        logger.info(f"Request started - trace_id: {trace_id}, {method} {path}")
+        if self._log_request_start and logger.isEnabledFor(logging.INFO):
+            logger.info("Request started - trace_id: %s, %s %s", trace_id, method, path)
 
         async def send_with_headers(message: Message) -> None:
             """Intercept response to add trace_id and timing headers"""
-            nonlocal process_time, status_code
+            nonlocal elapsed_ms, status_code
 
             if message["type"] == "http.response.start":
-                # Calculate processing time
-                process_time_ms = time.time() - start_time
-                process_time = str(int(round(process_time_ms * 1000)))
-                status_code = str(message.get("status", "unknown"))
+                elapsed_ms = _elapsed_ms(start_ns)
+                status_code = message.get("status", 0)
 
-                # Add headers using MutableHeaders for better handling
-                headers = MutableHeaders(scope=message)
-                headers.append("x-trace-id", trace_id)
-                headers.append("x-process-time", process_time)
+                headers = message.get("headers")
+                if not isinstance(headers, list):
+                    headers = message["headers"] = list(headers or ())
+                headers.append((_TRACE_HEADER, trace_id_header))
+                headers.append((b"x-process-time", str(elapsed_ms).encode("latin-1")))
 
             await send(message)
 
         try:
             # Process the request (OTEL context is already set if available)
             await self.app(scope, receive, send_with_headers)
-            logger.info(f"Request completed - trace_id: {trace_id}, {method} {path} - {process_time}ms - {status_code}")
+            self._log_completed(scope, trace_id, method, path, elapsed_ms, status_code)
         except Exception as exc:
             # Calculate processing time for error case
-            error_process_time_ms = time.time() - start_time
-            error_process_time = str(int(round(error_process_time_ms * 1000)))
+            error_elapsed_ms = _elapsed_ms(start_ns)
+            error_process_time = str(error_elapsed_ms)
 
             # Create error response using Starlette's JSONResponse
             if isinstance(exc, ApplicationException):
@@ -96,21 +151,78 @@ class RequestTraceMiddleware:
                 }
 
             logger.error(
-                f"Request failed - trace_id: {trace_id}, {method} {path} - {error_process_time}ms - {response_status} - {exc}"
+                "Request failed - trace_id: %s, %s %s - %sms - %s - %s",
+                trace_id,
+                method,
+                path,
+                error_process_time,
+                response_status,
+                exc,
             )
 
+            self._record(scope, method, response_status, error_elapsed_ms)
+
+            response_headers = {
+                "x-trace-id": trace_id,
+                "x-process-time": error_process_time,
+            }
+            if isinstance(exc, ApplicationException) and exc.headers:
+                response_headers.update(exc.headers)
+
             # Use Starlette's JSONResponse to ensure proper ASGI handling
             response = StarletteJSONResponse(
                 content=error_content,
                 status_code=response_status,
-                headers={
-                    "x-trace-id": trace_id,
-                    "x-process-time": error_process_time,
-                },
+                headers=response_headers,
             )
 
             # Send the response using Starlette's built-in ASGI handling
             await response(scope, receive, send)
+        finally:
+            current_trace_id.reset(trace_id_token)
+
+    def _log_completed(
+        self, scope: Scope, trace_id: str, method: str, path: str, elapsed_ms: int, status_code: int
+    ) -> None:
+        """Log a completed request, honouring sampling, slow-request and aggregation settings."""
+        self._record(scope, method, status_code, elapsed_ms)
+
+        if status_code >= 500:
+            level = logging.ERROR
+        elif self.slow_request_threshold_ms is not None and elapsed_ms >= self.slow_request_threshold_ms:
+            level = logging.WARNING
+        elif self.access_log_aggregator is not None:
+            return
+        else:
+            level = logging.INFO
+            if self.log_sample_rate > 1:
+                self._sample_counter += 1
+                if self._sample_counter % self.log_sample_rate:
+                    return
+
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "Request completed - trace_id: %s, %s %s - %sms - %s",
+                trace_id,
+                method,
+                path,
+                elapsed_ms,
+                status_code,
+            )
+
+    def _record(self, scope: Scope, method: str, status_code: int, elapsed_ms: int) -> None:
+        """Feed the request into the latency histogram and the access log aggregator."""
+        if _request_duration is None and self.access_log_aggregator is None:
+            return
+        route = _route_path(scope)
+        if _request_duration is not None:
+            _request_duration.record(
+                elapsed_ms,
+                {"http.request.method": method, "http.route": route, "http.response.status_code": status_code},
+            )
+        if self.access_log_aggregator is not None:
+            self.access_log_aggregator.record(method, route, status_code, elapsed_ms)
 
     def get_user_friendly_message(self, exc: Exception) -> str:
         """Convert technical exceptions to user-friendly messages"""
@@ -158,68 +270,46 @@ class RequestTraceMiddleware:
             scope: ASGI scope containing request information
 
         Returns:
-            Trace ID string (either from OTEL or fallback UUID)
+            Trace ID string (either from OTEL or a random 32-hex-digit fallback)
         """
         try:
             # First priority: Check headers for existing trace ID (for distributed tracing)
-            headers: dict[bytes, bytes] = dict(scope.get("headers", []))
-            trace_header = headers.get(b"x-trace-id")
-            if trace_header:
-                trace_id = trace_header.decode("utf-8")
-
-                # Set the trace context in OpenTelemetry if available
-                try:
-                    from opentelemetry import trace
-                    from opentelemetry.trace import SpanContext, TraceFlags
-                    from opentelemetry.trace.span import INVALID_SPAN_ID
-
-                    # Convert hex string to int for trace_id
-                    try:
-                        trace_id_int = int(trace_id, 16)
-                        # Create a span context with the trace ID from headers
-                        span_context = SpanContext(
-                            trace_id=trace_id_int,
-                            span_id=INVALID_SPAN_ID,  # We don't have span_id from headers
-                            is_remote=True,
-                            trace_flags=TraceFlags(0),
-                        )
-
-                        # Create a non-recording span with the context
-                        non_recording_span = trace.NonRecordingSpan(span_context)
-                        # Set the span context as current
-                        context = trace.set_span_in_context(non_recording_span)
-                        # Store context in scope for later use
-                        scope["otel_context"] = context
-                    except ValueError:
-                        logger.warning(f"Invalid trace ID format in header: {trace_id}")
-
-                except ImportError:
-                    pass
-                except Exception:
-                    pass
-
-                return trace_id
+            for name, value in scope.get("headers", ()):
+                if name == _TRACE_HEADER:
+                    if not value:
+                        # An empty header carries no trace, fall back like a missing one
+                        break
+                    trace_id = value.decode("latin-1")
+                    if otel_trace is not None:
+                        self._set_remote_otel_context(scope, trace_id)
+                    return trace_id
 
             # Second priority: Try to get from current OTEL span context
-            try:
-                from opentelemetry import trace
-
-                current_span = trace.get_current_span()
-                if current_span:
-                    span_context = current_span.get_span_context()
-                    if span_context and span_context.trace_id:
-                        trace_id = format(span_context.trace_id, "032x")
-                        return trace_id
-            except ImportError:
-                pass
-            except Exception:
-                pass
-
-            # Final fallback: generate UUID
-            fallback_trace_id = str(uuid.uuid4())
-            return fallback_trace_id
+            if otel_trace is not None:
+                span_context = otel_trace.get_current_span().get_span_context()
+                if span_context.trace_id:
+                    return format(span_context.trace_id, "032x")
 
         except Exception as e:
-            logger.warning(f"Failed to extract trace ID from OTEL context: {e}")
-            fallback_trace_id = str(uuid.uuid4())
-            return fallback_trace_id
+            logger.warning("Failed to extract trace ID from OTEL context: %s", e)
+
+        # Final fallback: random trace ID, generated the same way as the OTEL SDK does
+        return format(getrandbits(128), "032x")
+
+    @staticmethod
+    def _set_remote_otel_context(scope: Scope, trace_id: str) -> None:
+        """Store an OpenTelemetry context built from an incoming trace ID header in ``scope["otel_context"]``."""
+        try:
+            trace_id_int = int(trace_id, 16)
+        except ValueError:
+            logger.warning("Invalid trace ID format in header: %s", trace_id)
+            return
+
+        # Create a non-recording span with the trace ID from headers (no span_id is propagated)
+        span_context = SpanContext(
+            trace_id=trace_id_int,
+            span_id=INVALID_SPAN_ID,
+            is_remote=True,
+            trace_flags=TraceFlags(0),
+        )
+        scope["otel_context"] = otel_trace.set_span_in_context(NonRecordingSpan(span_context))
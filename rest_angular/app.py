@@ -4,6 +4,8 @@ from pathlib import Path
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from lelab_common import (
+    AccessLogAggregator,
+    CompressionMiddleware,
     RequestTraceMiddleware,
     get_configuration,
     responses_model,
@@ -11,11 +13,16 @@ from lelab_common import (
 from lelab_common.auth import get_current_user, get_oauth2_current_user
 
 from .config import settings
-from .infra.monitor.otel import setup_opentelemetry, stop_opentelemetry
-from .logging import configure_logging
+from .infra.cache.redis import close_redis_pool
+from .infra.monitor.loop_monitor import start_loop_monitor, stop_loop_monitor
+from .infra.monitor.otel import make_metrics_app, setup_opentelemetry, stop_opentelemetry
+from .logging import configure_logging, stop_logging
 from .modules.plans import routes as plans_routes
+from .modules.plans.snapshot import start_policy_snapshot, stop_policy_snapshot
+from .modules.system.profiling_routes import router as profiling_router
 from .modules.system.routes import router as system_router
 from .modules.users import user_routes
+from .openapi import CachedOpenAPI, install_cached_openapi
 
 
 def create_app() -> FastAPI:
@@ -31,8 +38,16 @@ def create_app() -> FastAPI:
         configure_logging()
         app.state.settings = settings
         setup_opentelemetry(app)
+        start_loop_monitor(settings)
+        await start_policy_snapshot(settings)
+        if cached_openapi is not None:
+            cached_openapi.build()
         yield
+        await stop_policy_snapshot()
+        await stop_loop_monitor()
         stop_opentelemetry(app)
+        await close_redis_pool()
+        stop_logging()
 
     app = FastAPI(
         lifespan=lifespan,
@@ -56,24 +71,62 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["x-trace-id", "x-process-time"],
+        expose_headers=[
+            "x-trace-id",
+            "x-process-time",
+            "ratelimit-limit",
+            "ratelimit-remaining",
+            "ratelimit-reset",
+            "retry-after",
+        ],
+    )
+    if settings.compression_enabled:
+        # Precompressed static files carry Content-Encoding and are passed through untouched
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+    app.add_middleware(
+        RequestTraceMiddleware,
+        log_sample_rate=settings.request_log_sample_rate,
+        slow_request_threshold_ms=settings.request_log_slow_threshold_ms,
+        access_log_aggregator=(
+            AccessLogAggregator(interval=settings.access_log_summary_interval)
+            if settings.access_log_summary_interval
+            else None
+        ),
     )
-    app.add_middleware(RequestTraceMiddleware)
 
     """ Add API routes first (higher priority) """
     api_router = APIRouter(prefix="/api")
     api_router.include_router(system_router)
     api_router.include_router(user_routes.router)
     api_router.include_router(plans_routes.router)
+    if settings.profiling_enabled:
+        api_router.include_router(profiling_router)
     app.include_router(api_router)
 
+    """ OpenAPI document generated once at startup instead of on the first request """
+    cached_openapi: CachedOpenAPI | None = None
+    if settings.openapi_enabled:
+        cached_openapi = install_cached_openapi(
+            app, Path(settings.openapi_cache_path) if settings.openapi_cache_path else None
+        )
+
+    """ Prometheus scrape endpoint (registered before the SPA catch-all route) """
+    if settings.prometheus_metrics_enabled:
+        app.mount("/metrics", make_metrics_app())
+
     """ Static files for Angular app (production only) """
     static_dir = Path(__file__).parent / "static"
     index_file = static_dir / "index.html"
     if index_file.exists():
         # Import required modules
         from fastapi import Request
-        from fastapi.responses import FileResponse
+
+        from .static_files import CachedFile, build_static_manifest, serve_asset
+
+        # Files are read, hashed and compressed once here, requests are served from memory
+        static_manifest = build_static_manifest(static_dir)
+        # index.html is served with no-cache so browsers revalidate it by ETag; reloaded on change in dev
+        index_page = CachedFile(static_manifest, "index.html", reload=settings.environment == "dev")
 
         # Serve static files at root path and handle Angular SPA routing
         @app.get("/{file_path:path}")
@@ -83,18 +136,18 @@ def create_app() -> FastAPI:
             This catch-all route handles all non-API requests.
             Priority: Static files > Angular SPA (index.html)
             """
-            # Handle root path - serve index.html
-            if not file_path or file_path == "":
-                return FileResponse(index_file)
+            # Handle root path and index.html itself - serve index.html
+            if not file_path or file_path == index_page.key:
+                return serve_asset(request, index_page.asset)
 
             # Check if it's a static file request
-            static_file_path = static_dir / file_path
-            if static_file_path.exists() and static_file_path.is_file():
-                return FileResponse(static_file_path)
+            asset = static_manifest.get(file_path)
+            if asset is not None:
+                return serve_asset(request, asset)
 
             # For all other routes, serve index.html (Angular SPA routing)
             # This enables Angular's client-side routing
-            return FileResponse(index_file)
+            return serve_asset(request, index_page.asset)
 
     """ Dependency overrides """
     app.dependency_overrides[get_configuration] = lambda: settings
@@ -7,6 +7,7 @@ from .infra.cache.settings import RedisSettings
 from .infra.monitor.settings import MonitorSettings
 from .infra.orm.settings import DatabaseSettings
 from .modules.plans.settings import PlansSettings
+from .modules.system.settings import SystemSettings
 from .modules.users.settings import UserSettings
 
 __all__ = ["settings"]
@@ -21,13 +22,28 @@ class RestAngularAppSettings(AppSettings):
     """
 
     openapi_enabled: bool = Field(default=True, description="Enable OpenAPI")
+    openapi_cache_path: str | None = Field(
+        default=None, description="File the generated OpenAPI document is cached in between boots"
+    )
     openapi_oauth2_client_id: str = Field(default="oauth2-client-id", description="OpenAPI OAuth2 client ID")
     openapi_oauth2_client_secret: str | None = Field(default=None, description="OpenAPI OAuth2 client secret")
     openapi_oauth2_scopes: str = Field(default="oauth2-scopes", description="OpenAPI OAuth2 scopes")
 
+    compression_enabled: bool = Field(default=True, description="Compress responses with brotli, zstd or gzip")
+    compression_minimum_size: int = Field(
+        default=500, ge=0, description="Responses smaller than this many bytes are sent uncompressed"
+    )
+
 
 class _Settings(
-    RestAngularAppSettings, DatabaseSettings, RedisSettings, MonitorSettings, KafkaSettings, UserSettings, PlansSettings
+    RestAngularAppSettings,
+    DatabaseSettings,
+    RedisSettings,
+    MonitorSettings,
+    KafkaSettings,
+    UserSettings,
+    PlansSettings,
+    SystemSettings,
 ):
     """Main settings class that combines all domain settings."""
 
@@ -0,0 +1,69 @@
+import logging
+from time import monotonic
+from typing import Callable, Literal
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Consecutive failure circuit breaker guarding calls to a remote dependency.
+
+    While closed, every call is allowed. After ``failure_threshold`` consecutive failures
+    the circuit opens and calls are refused without touching the dependency. Once
+    ``reset_timeout`` seconds have passed, a single trial call is let through
+    (half-open): its success closes the circuit, its failure opens it again.
+
+    Not thread safe, meant to be used from one event loop.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_started_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self._trial_started_at is not None else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        if self._opened_at is None:
+            return True
+        now = self._clock()
+        # A trial that never reported back (e.g. cancelled) is replaced after another timeout
+        last_attempt = self._trial_started_at if self._trial_started_at is not None else self._opened_at
+        if now - last_attempt >= self.reset_timeout:
+            self._trial_started_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info(f"Circuit '{self.name}' closed, the dependency recovered")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_started_at is not None or (
+            self._opened_at is None and self._failures >= self.failure_threshold
+        ):
+            if self._opened_at is None:
+                logger.warning(
+                    f"Circuit '{self.name}' opened after {self._failures} consecutive failures, "
+                    f"retrying in {self.reset_timeout}s"
+                )
+            self._opened_at = self._clock()
+            self._trial_started_at = None
@@ -2,44 +2,88 @@ from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends
 from lelab_common import Settings
-from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio import ConnectionPool, Redis, RedisCluster
 
 from .exceptions import RedisConnectionException
 from .settings import RedisSettings
 
+_redis_pool: ConnectionPool | None = None
+_redis_cluster: RedisCluster | None = None
 
-async def get_redis_context(settings: Settings) -> AsyncGenerator[Redis, None]:
-    """Get redis connection with safe memory management."""
+
+def get_redis_pool(settings: Settings) -> ConnectionPool:
+    """Get the connection pool shared by all redis clients."""
+    if not isinstance(settings, RedisSettings):
+        raise NotImplementedError("The application settings is not inherited from RedisSettings")
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = ConnectionPool.from_url(settings.redis_url, max_connections=settings.redis_max_connections)
+    return _redis_pool
+
+
+def get_redis_cluster(settings: Settings) -> RedisCluster:
+    """
+    Get the Redis Cluster client shared by all requests.
+
+    The cluster client keeps one connection pool per node and routes every command to
+    the node owning its key slot, so it is created once per worker instead of per request.
+    ``redis_max_connections`` limits the connections to each node.
+    """
     if not isinstance(settings, RedisSettings):
         raise NotImplementedError("The application settings is not inherited from RedisSettings")
+    global _redis_cluster
+    if _redis_cluster is None:
+        options = {}
+        if settings.redis_max_connections is not None:
+            options["max_connections"] = settings.redis_max_connections
+        _redis_cluster = RedisCluster.from_url(settings.redis_url, **options)
+    return _redis_cluster
+
 
+async def close_redis_pool() -> None:
+    """Disconnect the shared connection pool and the shared cluster client."""
+    global _redis_pool, _redis_cluster
+    if _redis_pool is not None:
+        pool, _redis_pool = _redis_pool, None
+        await pool.disconnect()
+    if _redis_cluster is not None:
+        cluster, _redis_cluster = _redis_cluster, None
+        await cluster.aclose()
+
+
+async def get_redis_context(settings: Settings) -> AsyncGenerator[Redis | RedisCluster, None]:
+    """Get redis connection with safe memory management."""
+    if isinstance(settings, RedisSettings) and settings.redis_cluster:
+        # The shared cluster client is closed on shutdown, not after each request
+        yield get_redis_cluster(settings)
+        return
+
+    pool = get_redis_pool(settings)
     try:
-        pool = ConnectionPool.from_url(settings.redis_url)
         redis_client = Redis(connection_pool=pool)
 
         try:
             yield redis_client
         finally:
+            # Returns the connection to the shared pool, the pool itself stays open
             await redis_client.aclose()
-            await pool.disconnect()
     except Exception as e:
         raise RedisConnectionException(f"Failed to get redis connection: {e}")
 
 
-RedisContext = Annotated[Redis, Depends(get_redis_context)]
+RedisContext = Annotated[Redis | RedisCluster, Depends(get_redis_context)]
 
 
-async def get_redis(settings: Settings) -> Redis:
+async def get_redis(settings: Settings) -> Redis | RedisCluster:
     """Get redis connection with manual memory management."""
-    if not isinstance(settings, RedisSettings):
-        raise NotImplementedError("The application settings is not inherited from RedisSettings")
+    if isinstance(settings, RedisSettings) and settings.redis_cluster:
+        return get_redis_cluster(settings)
 
+    pool = get_redis_pool(settings)
     try:
-        pool = ConnectionPool.from_url(settings.redis_url)
-        redis_client = Redis(connection_pool=pool)
-        return redis_client
+        return Redis(connection_pool=pool)
     except Exception as e:
         raise RedisConnectionException(f"Failed to get redis connection: {e}")
 
 
-RedisClient = Annotated[Redis, Depends(get_redis)]
+RedisClient = Annotated[Redis | RedisCluster, Depends(get_redis)]
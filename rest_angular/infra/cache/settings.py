@@ -13,6 +13,12 @@ class RedisSettings(BaseSettings):
     redis_user: str | None = Field(default=None, description="Redis username")
     redis_password: str | None = Field(default=None, description="Redis password")
     redis_db: int | None = Field(default=None, description="Redis database number")
+    redis_max_connections: int | None = Field(
+        default=None, gt=0, description="Maximum connections in the shared Redis pool"
+    )
+    redis_cluster: bool = Field(
+        default=False, description="Connect to a Redis Cluster, REDIS_HOST and REDIS_PORT name any node"
+    )
 
     @cached_property
     def redis_url(self) -> str:
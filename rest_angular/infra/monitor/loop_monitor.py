@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import Any
+
+from lelab_common import Settings
+
+from .metrics import event_loop_lag, event_loop_slow_callbacks
+from .settings import MonitorSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class SlowCallback:
+    """A period during which the event loop could not run its scheduled callbacks."""
+
+    detected_at: float
+    duration_ms: float
+    stack: str | None
+
+
+class LoopMonitor:
+    """
+    Measures event loop scheduling lag and captures the stack of slow callbacks.
+
+    A heartbeat task sleeps for ``interval`` seconds and measures how late it wakes up.
+    A watchdog thread checks the heartbeat independently of the loop: when the loop has
+    been blocked for longer than ``slow_callback_threshold`` it captures the stack of the
+    loop thread, which points at the code that is blocking it. Once the heartbeat runs
+    again, the blocked period is recorded as a ``SlowCallback``, logged as a warning and
+    counted in the ``event_loop.slow_callbacks`` metric. Every measured lag is recorded in
+    the ``event_loop.lag`` histogram.
+    """
+
+    def __init__(self, interval: float = 0.1, slow_callback_threshold: float = 0.1, history: int = 50):
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=history)
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._lag_total_ms = 0.0
+        self._lag_count = 0
+        self._expected_wakeup = 0.0
+        self._pending_stack: str | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._expected_wakeup = monotonic() + self.interval
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring and wait for the heartbeat task and watchdog thread to exit."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stopped.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    def report(self) -> dict[str, Any]:
+        """Lag statistics and recent slow callbacks, most recent last."""
+        return {
+            "interval_ms": self.interval * 1000,
+            "slow_callback_threshold_ms": self.slow_callback_threshold * 1000,
+            "lag_ms": {
+                "last": round(self.last_lag_ms, 3),
+                "max": round(self.max_lag_ms, 3),
+                "avg": round(self._lag_total_ms / self._lag_count, 3) if self._lag_count else 0.0,
+            },
+            "slow_callbacks": [
+                {
+                    "detected_at": slow_callback.detected_at,
+                    "duration_ms": round(slow_callback.duration_ms, 3),
+                    "stack": slow_callback.stack,
+                }
+                for slow_callback in self.slow_callbacks
+            ],
+        }
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._expected_wakeup = monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(monotonic() - self._expected_wakeup, 0.0) * 1000
+            self._record_lag(lag_ms)
+
+    def _record_lag(self, lag_ms: float) -> None:
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self._lag_total_ms += lag_ms
+        self._lag_count += 1
+        event_loop_lag.record(lag_ms)
+
+        stack, self._pending_stack = self._pending_stack, None
+        if lag_ms >= self.slow_callback_threshold * 1000:
+            self.slow_callbacks.append(SlowCallback(detected_at=time(), duration_ms=lag_ms, stack=stack))
+            event_loop_slow_callbacks.add(1)
+            logger.warning(
+                "Event loop blocked for %dms by a slow callback:\n%s",
+                lag_ms,
+                stack.rstrip() if stack else "<stack not captured>",
+            )
+
+    def _watch(self) -> None:
+        check_interval = max(self.slow_callback_threshold / 2, 0.005)
+        captured_for = 0.0
+        while not self._stopped.wait(check_interval):
+            expected_wakeup = self._expected_wakeup
+            if captured_for == expected_wakeup:
+                continue
+            if monotonic() - expected_wakeup >= self.slow_callback_threshold:
+                self._pending_stack = self._capture_loop_stack()
+                captured_for = expected_wakeup
+
+    def _capture_loop_stack(self) -> str | None:
+        if self._loop_thread_id is None:
+            return None
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame))
+
+
+_loop_monitor: LoopMonitor | None = None
+
+
+def start_loop_monitor(settings: Settings) -> None:
+    """
+    Start the application wide event loop monitor if enabled in settings.
+
+    :param settings: application settings.
+    """
+    if not isinstance(settings, MonitorSettings):
+        raise NotImplementedError("The application settings is not inherited from MonitorSettings")
+    if not settings.loop_monitor_enabled:
+        return
+
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval_ms / 1000,
+            slow_callback_threshold=settings.loop_slow_callback_threshold_ms / 1000,
+        )
+    _loop_monitor.start()
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the application wide event loop monitor."""
+    global _loop_monitor
+    if _loop_monitor is not None:
+        monitor, _loop_monitor = _loop_monitor, None
+        await monitor.stop()
+
+
+def get_loop_monitor() -> LoopMonitor | None:
+    """Get the application wide event loop monitor, if it is running."""
+    return _loop_monitor
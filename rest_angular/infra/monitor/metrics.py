@@ -0,0 +1,90 @@
+from typing import Iterable
+
+from lelab_common.logger import get_dropped_log_records
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+from sqlalchemy import QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Instruments are created on the global proxy meter, so they are no-ops until
+# setup_opentelemetry installs a MeterProvider and start recording afterwards.
+meter = get_meter("rest_angular")
+
+db_session_duration = meter.create_histogram(
+    "db.client.session.duration",
+    unit="ms",
+    description="Time a unit of work holds its database session",
+)
+rate_limit_decisions = meter.create_counter(
+    "rate_limit.decisions",
+    unit="{decision}",
+    description="Rate limiter decisions by outcome",
+)
+rate_limit_redis_duration = meter.create_histogram(
+    "rate_limit.redis.duration",
+    unit="ms",
+    description="Latency of the Redis round trips made by the rate limiter",
+)
+
+event_loop_lag = meter.create_histogram(
+    "event_loop.lag",
+    unit="ms",
+    description="Delay between the scheduled and actual wake-up of the event loop heartbeat",
+)
+event_loop_slow_callbacks = meter.create_counter(
+    "event_loop.slow_callbacks",
+    unit="{callback}",
+    description="Times the event loop was blocked longer than the slow callback threshold",
+)
+
+_observed_engine: AsyncEngine | None = None
+
+
+def observe_db_pool(engine: AsyncEngine) -> None:
+    """
+    Report connection pool saturation of the given engine through the pool gauges.
+
+    :param engine: shared application engine.
+    """
+    global _observed_engine
+    _observed_engine = engine
+
+
+def _db_pool_usage(options: CallbackOptions) -> Iterable[Observation]:
+    if _observed_engine is None:
+        return
+    pool = _observed_engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        yield Observation(pool.checkedout(), {"state": "used"})
+        yield Observation(pool.checkedin(), {"state": "idle"})
+
+
+def _db_pool_max(options: CallbackOptions) -> Iterable[Observation]:
+    if _observed_engine is None:
+        return
+    pool = _observed_engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        yield Observation(pool.size() + max(pool._max_overflow, 0))
+
+
+def _dropped_log_records(options: CallbackOptions) -> Iterable[Observation]:
+    yield Observation(get_dropped_log_records())
+
+
+meter.create_observable_gauge(
+    "db.client.connections.usage",
+    callbacks=[_db_pool_usage],
+    unit="{connection}",
+    description="Database connections in the pool by state",
+)
+meter.create_observable_gauge(
+    "db.client.connections.max",
+    callbacks=[_db_pool_max],
+    unit="{connection}",
+    description="Maximum database connections the pool can open, including overflow",
+)
+meter.create_observable_counter(
+    "logging.dropped_records",
+    callbacks=[_dropped_log_records],
+    unit="{record}",
+    description="Log records dropped because the async logging queue was full",
+)
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 from lelab_common import AppSettings, Settings
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
 from opentelemetry.instrumentation.redis import RedisInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.metrics import NoOpMeterProvider, set_meter_provider
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import MetricReader, PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import (
     DEPLOYMENT_ENVIRONMENT,
     SERVICE_NAME,
@@ -13,9 +17,35 @@ from opentelemetry.sdk.resources import (
 )
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.trace import set_tracer_provider
+from starlette.types import ASGIApp
 
+from ..orm.sa import get_database_engine
+from .metrics import observe_db_pool
+from .sampling import ErrorSamplingSpanProcessor, RecordUnsampledSampler
 from .settings import MonitorSettings
+from .tracing import configure_rate_limit_spans
+
+try:
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader  # pyright: ignore[reportMissingImports]
+    from prometheus_client import make_asgi_app  # pyright: ignore[reportMissingImports]
+except ImportError:  # Prometheus export is optional, see the ``prometheus`` extra
+    PrometheusMetricReader = None
+    make_asgi_app = None
+
+
+def make_metrics_app() -> ASGIApp:
+    """
+    Create the ASGI app serving the Prometheus ``/metrics`` endpoint.
+
+    :return: prometheus exposition app.
+    """
+    if make_asgi_app is None:
+        raise RuntimeError(
+            "Prometheus metrics require the opentelemetry-exporter-prometheus and prometheus-client packages"
+        )
+    return make_asgi_app()
 
 
 def setup_opentelemetry(app: FastAPI) -> None:
@@ -32,7 +62,7 @@ def setup_opentelemetry(app: FastAPI) -> None:
 
     opentelemetry_endpoint = settings.opentelemetry_endpoint
 
-    if not opentelemetry_endpoint:
+    if not opentelemetry_endpoint and not settings.prometheus_metrics_enabled:
         return
 
     if isinstance(settings, AppSettings):
@@ -42,45 +72,70 @@ def setup_opentelemetry(app: FastAPI) -> None:
         environment = "dev"
         log_level = "INFO"
 
-    tracer_provider = TracerProvider(
-        resource=Resource(
-            attributes={
-                SERVICE_NAME: "rest_angular",
-                TELEMETRY_SDK_LANGUAGE: "python",
-                DEPLOYMENT_ENVIRONMENT: environment,
-            },
-        ),
+    resource = Resource(
+        attributes={
+            SERVICE_NAME: "rest_angular",
+            TELEMETRY_SDK_LANGUAGE: "python",
+            DEPLOYMENT_ENVIRONMENT: environment,
+        },
     )
 
+    _setup_metrics(app, settings, resource)
+
+    if not opentelemetry_endpoint:
+        return
+
+    sample_ratio = settings.opentelemetry_trace_sample_ratio
+    # Unsampled spans only need to be recorded when errors may still promote them
+    sample_errors = settings.opentelemetry_sample_errors and sample_ratio < 1.0
+    if sample_errors:
+        sampler = RecordUnsampledSampler(sample_ratio)
+        span_processor_class = ErrorSamplingSpanProcessor
+    else:
+        sampler = ParentBased(TraceIdRatioBased(sample_ratio))
+        span_processor_class = BatchSpanProcessor
+
+    tracer_provider = TracerProvider(resource=resource, sampler=sampler)
+    app.state.tracer_provider = tracer_provider
+
     tracer_provider.add_span_processor(
-        BatchSpanProcessor(
+        span_processor_class(
             OTLPSpanExporter(
                 endpoint=opentelemetry_endpoint,
                 insecure=True,
             ),
+            max_queue_size=settings.opentelemetry_span_queue_size,
+            max_export_batch_size=settings.opentelemetry_span_batch_size,
+            schedule_delay_millis=settings.opentelemetry_span_schedule_delay_ms,
         ),
     )
 
     excluded_endpoints = [
         app.url_path_for("health_check"),
+        app.url_path_for("liveness_check"),
+        app.url_path_for("readiness_check"),
         app.url_path_for("openapi"),
         app.url_path_for("swagger_ui_html"),
         app.url_path_for("swagger_ui_redirect"),
         app.url_path_for("redoc_html"),
     ]
 
+    # Request latency metrics are recorded by RequestTraceMiddleware, so only take traces from here
     FastAPIInstrumentor().instrument_app(
         app,
         tracer_provider=tracer_provider,
+        meter_provider=NoOpMeterProvider(),
         excluded_urls=",".join(excluded_endpoints),
     )
+    # Patches the Redis client class, so every client sharing the pool from infra/cache/redis.py is traced
     RedisInstrumentor().instrument(
         tracer_provider=tracer_provider,
     )
     SQLAlchemyInstrumentor().instrument(
         tracer_provider=tracer_provider,
-        engine=app.state.db_engine.sync_engine,
+        engine=get_database_engine(settings).sync_engine,
     )
+    configure_rate_limit_spans(settings.opentelemetry_trace_rate_limit_queries)
     LoggingInstrumentor().instrument(
         tracer_provider=tracer_provider,
         set_logging_format=True,
@@ -90,11 +145,55 @@ def setup_opentelemetry(app: FastAPI) -> None:
     set_tracer_provider(tracer_provider=tracer_provider)
 
 
+def _setup_metrics(app: FastAPI, settings: MonitorSettings, resource: Resource) -> None:
+    """
+    Install the global meter provider with OTLP and/or Prometheus readers.
+
+    :param app: current application.
+    :param settings: monitoring settings.
+    :param resource: resource describing this service.
+    """
+    readers: list[MetricReader] = []
+    if settings.opentelemetry_endpoint:
+        readers.append(
+            PeriodicExportingMetricReader(
+                OTLPMetricExporter(endpoint=settings.opentelemetry_endpoint, insecure=True),
+                export_interval_millis=settings.opentelemetry_metrics_export_interval * 1000,
+            )
+        )
+    if settings.prometheus_metrics_enabled:
+        if PrometheusMetricReader is None:
+            raise RuntimeError(
+                "Prometheus metrics require the opentelemetry-exporter-prometheus and prometheus-client packages"
+            )
+        readers.append(PrometheusMetricReader())
+
+    meter_provider = MeterProvider(resource=resource, metric_readers=readers)
+    set_meter_provider(meter_provider)
+    app.state.meter_provider = meter_provider
+
+    observe_db_pool(get_database_engine(settings))
+
+
 def stop_opentelemetry(app: FastAPI) -> None:
     """
     Disables opentelemetry instrumentation.
 
     :param app: current application.
     """
-    # Cleanup if needed
-    pass
+    tracer_provider: TracerProvider | None = getattr(app.state, "tracer_provider", None)
+    if tracer_provider is not None:
+        FastAPIInstrumentor.uninstrument_app(app)
+        for instrumentor in (RedisInstrumentor(), SQLAlchemyInstrumentor(), LoggingInstrumentor()):
+            if instrumentor.is_instrumented_by_opentelemetry:
+                instrumentor.uninstrument()
+        # Export the spans still buffered in the batch processor before closing the exporter
+        tracer_provider.force_flush()
+        tracer_provider.shutdown()
+        app.state.tracer_provider = None
+
+    meter_provider: MeterProvider | None = getattr(app.state, "meter_provider", None)
+    if meter_provider is not None:
+        meter_provider.force_flush()
+        meter_provider.shutdown()
+        app.state.meter_provider = None
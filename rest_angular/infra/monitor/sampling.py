@@ -0,0 +1,83 @@
+from typing import Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+
+class RecordUnsampledSampler(Sampler):
+    """
+    Parent-based ratio sampler that keeps recording the spans it does not sample.
+
+    Unsampled spans are created as ``RECORD_ONLY`` instead of being dropped, so their
+    status is still known when they end and ``ErrorSamplingSpanProcessor`` can export
+    the ones that failed. Nothing is exported for them otherwise.
+    """
+
+    def __init__(self, ratio: float):
+        self._delegate = ParentBased(TraceIdRatioBased(ratio))
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: TraceState | None = None,
+    ) -> SamplingResult:
+        result = self._delegate.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+        if result.decision is not Decision.DROP:
+            return result
+        return SamplingResult(Decision.RECORD_ONLY, result.attributes, result.trace_state)
+
+    def get_description(self) -> str:
+        return f"RecordUnsampled{{{self._delegate.get_description()}}}"
+
+
+class ErrorSamplingSpanProcessor(BatchSpanProcessor):
+    """
+    Batch span processor that also exports unsampled spans which ended with an error.
+
+    The exported copy is marked as sampled so a tail-sampling collector keeps it.
+    """
+
+    def on_end(self, span: ReadableSpan) -> None:
+        context = span.context
+        if context is not None and not context.trace_flags.sampled and span.status.status_code is StatusCode.ERROR:
+            span = _as_sampled(span, context)
+        super().on_end(span)
+
+
+def _as_sampled(span: ReadableSpan, context: SpanContext) -> ReadableSpan:
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            trace_id=context.trace_id,
+            span_id=context.span_id,
+            is_remote=context.is_remote,
+            trace_flags=TraceFlags(context.trace_flags | TraceFlags.SAMPLED),
+            trace_state=context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -6,3 +8,53 @@ class MonitorSettings(BaseSettings):
     """Monitoring and observability settings."""
 
     opentelemetry_endpoint: str | None = Field(default=None, description="OpenTelemetry Grpc endpoint")
+    opentelemetry_metrics_export_interval: int = Field(
+        default=60, gt=0, description="Seconds between OTLP metric exports"
+    )
+    prometheus_metrics_enabled: bool = Field(
+        default=False, description="Expose OpenTelemetry metrics in Prometheus format at /metrics"
+    )
+
+    # Trace sampling and export
+    opentelemetry_trace_sample_ratio: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Fraction of new traces to sample; child spans follow their parent"
+    )
+    opentelemetry_sample_errors: bool = Field(
+        default=True, description="Export spans that end with an error even when their trace was not sampled"
+    )
+    opentelemetry_span_queue_size: int = Field(default=2048, gt=0, description="Maximum spans buffered for export")
+    opentelemetry_span_batch_size: int = Field(default=512, gt=0, description="Maximum spans per export batch")
+    opentelemetry_span_schedule_delay_ms: int = Field(
+        default=5000, gt=0, description="Milliseconds between span exports"
+    )
+    opentelemetry_trace_rate_limit_queries: bool = Field(
+        default=True, description="Create spans for the Redis and database calls of the rate limiter"
+    )
+
+    # Event loop monitoring
+    loop_monitor_enabled: bool = Field(default=True, description="Measure event loop lag and report slow callbacks")
+    loop_monitor_interval_ms: int = Field(default=100, gt=0, description="Milliseconds between event loop lag checks")
+    loop_slow_callback_threshold_ms: int = Field(
+        default=100, gt=0, description="Event loop blocking time logged as a slow callback with its stack"
+    )
+
+    # Request logging
+    request_log_sample_rate: int = Field(default=1, ge=1, description="Log one in N successful requests")
+    request_log_slow_threshold_ms: int | None = Field(
+        default=None, ge=0, description="Always log requests slower than this many milliseconds"
+    )
+    access_log_summary_interval: int | None = Field(
+        default=None,
+        gt=0,
+        description="Replace per-request logs with a per-route latency summary every N seconds",
+    )
+
+    # Log handler pipeline
+    log_async: bool = Field(default=False, description="Write logs from a background thread through a bounded queue")
+    log_queue_size: int = Field(default=10000, gt=0, description="Maximum number of log records buffered in async mode")
+    log_queue_full_policy: Literal["drop", "block"] = Field(
+        default="drop", description="Drop records or block the caller when the async log queue is full"
+    )
+    log_format: Literal["text", "json"] = Field(
+        default="text", description="Log line format: tab-separated text or one JSON object per line"
+    )
@@ -0,0 +1,27 @@
+from contextlib import AbstractContextManager, nullcontext
+
+from opentelemetry.instrumentation.utils import suppress_instrumentation
+
+_rate_limit_spans_enabled = True
+
+
+def configure_rate_limit_spans(enabled: bool) -> None:
+    """
+    Enable or disable the per-statement spans of rate limiter lookups.
+
+    :param enabled: whether Redis and database calls made by the rate limiter are traced.
+    """
+    global _rate_limit_spans_enabled
+    _rate_limit_spans_enabled = enabled
+
+
+def rate_limit_spans() -> AbstractContextManager[None]:
+    """
+    Scope for rate limiter Redis and database calls.
+
+    Suppresses their instrumentation when rate limit spans are disabled, so the
+    high-frequency lookups made on every request do not produce spans.
+    """
+    if _rate_limit_spans_enabled:
+        return nullcontext()
+    return suppress_instrumentation()
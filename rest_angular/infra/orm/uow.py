@@ -1,3 +1,4 @@
+from time import perf_counter
 from types import TracebackType
 from typing import Annotated, Any, AsyncGenerator, Coroutine, TypeVar
 
@@ -5,6 +6,7 @@ from fastapi import Depends, Request
 from lelab_common import CancellationContext, CancellationContextDep
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..monitor.metrics import db_session_duration
 from .sa import AsyncSessionFactory
 
 T = TypeVar("T")
@@ -15,9 +17,11 @@ class UnitOfWork:
         self._session_factory: AsyncSessionFactory = session_factory
         self._context: CancellationContext = cancellation_context
         self.session: AsyncSession | None = None
+        self._started_at = 0.0
 
     async def __aenter__(self) -> "UnitOfWork":
         self.session = self._session_factory()
+        self._started_at = perf_counter()
         return self
 
     async def __aexit__(
@@ -25,11 +29,16 @@ class UnitOfWork:
     ) -> None:
         if not self.session:
             return
-        if exc:
-            await self.session.rollback()
-        else:
-            await self.session.commit()
-        await self.session.close()
+        try:
+            if exc:
+                await self.session.rollback()
+            else:
+                await self.session.commit()
+            await self.session.close()
+        finally:
+            db_session_duration.record(
+                (perf_counter() - self._started_at) * 1000, {"outcome": "rollback" if exc else "commit"}
+            )
 
     async def wait_for(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
         return await self._context.wait_for(coro, timeout)
@@ -1,7 +1,7 @@
 import logging
 from pathlib import Path
 
-from lelab_common.logger import setup_logger
+from lelab_common.logger import setup_logger, shutdown_logger
 
 from .config import settings
 
@@ -13,6 +13,8 @@ def configure_logging() -> logging.Logger:
     It sets up the root logger with:
     - Console handler with colored output (ISO8601 time)
     - File handler with daily rotation (ISO8601 time) in workspace logs folder
+    - Optionally, a bounded queue so handlers write from a background thread (LOG_ASYNC)
+    - Optionally, JSON lines with trace_id/span_id instead of text (LOG_FORMAT=json)
     """
     # Workspace logs folder
     log_dir = Path("logs")
@@ -23,6 +25,10 @@ def configure_logging() -> logging.Logger:
         log_filename="rest_angular.log",
         rotation="midnight",
         retention_days=7,
+        async_mode=settings.log_async,
+        queue_size=settings.log_queue_size,
+        queue_full_policy=settings.log_queue_full_policy,
+        log_format=settings.log_format,
     )
 
     # Configure additional handlers for production
@@ -32,6 +38,11 @@ def configure_logging() -> logging.Logger:
     return logger
 
 
+def stop_logging() -> None:
+    """Flush and stop the async logging pipeline, if enabled."""
+    shutdown_logger()
+
+
 def _configure_production_logging(logger: logging.Logger) -> None:
     """
     Add production-specific log handlers.
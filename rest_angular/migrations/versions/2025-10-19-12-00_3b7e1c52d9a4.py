@@ -0,0 +1,48 @@
+"""composite and partial indexes for plans lookups
+
+Revision ID: 3b7e1c52d9a4
+Revises: 9ac0615b41e7
+Create Date: 2025-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e1c52d9a4'
+down_revision: Union[str, None] = '9ac0615b41e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tier_targets_active_target',
+        'tier_targets',
+        ['target_type', 'target_id'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+        postgresql_include=['id', 'tier_id'],
+    )
+    op.create_index('ix_tier_targets_tier_id_target_type', 'tier_targets', ['tier_id', 'target_type'], unique=False)
+    op.drop_index(op.f('ix_tier_targets_tier_id'), table_name='tier_targets')
+    op.create_index(
+        'ix_rate_limits_tier_target_id_path',
+        'rate_limits',
+        ['tier_target_id', 'path'],
+        unique=False,
+        postgresql_include=['limit', 'period'],
+    )
+    op.drop_index(op.f('ix_rate_limits_tier_target_id'), table_name='rate_limits')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_rate_limits_tier_target_id'), 'rate_limits', ['tier_target_id'], unique=False)
+    op.drop_index('ix_rate_limits_tier_target_id_path', table_name='rate_limits')
+    op.create_index(op.f('ix_tier_targets_tier_id'), 'tier_targets', ['tier_id'], unique=False)
+    op.drop_index('ix_tier_targets_tier_id_target_type', table_name='tier_targets')
+    op.drop_index('ix_tier_targets_active_target', table_name='tier_targets')
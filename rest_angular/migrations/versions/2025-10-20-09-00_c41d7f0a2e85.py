@@ -0,0 +1,56 @@
+"""plans policy version counter
+
+Revision ID: c41d7f0a2e85
+Revises: 3b7e1c52d9a4
+Create Date: 2025-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7f0a2e85'
+down_revision: Union[str, None] = '3b7e1c52d9a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POLICY_TABLES = ('tiers', 'tier_targets', 'rate_limits')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'plans_policy_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute('INSERT INTO plans_policy_version (id, version) VALUES (1, 0)')
+    op.execute(
+        """
+        CREATE FUNCTION bump_plans_policy_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE plans_policy_version SET version = version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in POLICY_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_plans_policy_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_plans_policy_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in POLICY_TABLES:
+        op.execute(f'DROP TRIGGER {table}_bump_plans_policy_version ON {table}')
+    op.execute('DROP FUNCTION bump_plans_policy_version()')
+    op.drop_table('plans_policy_version')
@@ -1,10 +1,13 @@
 import logging
 from typing import Any
 
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 from lelab_common import Settings
 
+from ...infra.monitor.tracing import rate_limit_spans
 from .exceptions import RateLimitException
+from .rules import RateLimitRule
+from .schemas import sanitize_path
 from .service import PlansServiceDep, RateLimiterDep
 from .settings import PlansSettings
 
@@ -16,8 +19,21 @@ async def get_optional_user() -> dict[str, Any] | None:
     return None
 
 
+def get_route_path(request: Request) -> str:
+    """
+    Sanitized template of the matched route, e.g. ``api_users_{user_id}``.
+
+    Limits are resolved and counted per route rather than per URL, so requests for
+    different ids of the same resource share a policy and a counter. Falls back to the
+    URL path when no route matched.
+    """
+    route = request.scope.get("route")
+    return sanitize_path(getattr(route, "path_format", None) or request.url.path)
+
+
 async def rate_limiter_dependency(
     request: Request,
+    response: Response,
     rate_limiter: RateLimiterDep,
     settings: Settings,
     service: PlansServiceDep,
@@ -25,43 +41,39 @@ async def rate_limiter_dependency(
 ) -> None:
     if not isinstance(settings, PlansSettings):
         settings = PlansSettings()
-    path = request.url.path
-
-    if user:
-        user_id = user.get("id")
-        tier_id = user.get("tier_id")
-        if tier_id:
-            tier = await service.get_tier(tier_id)
-            if tier:
-                rate_limit = await service.get_rate_limit(tier.id, path)
-                if rate_limit:
-                    limit, period = rate_limit.limit, rate_limit.period
-                else:
+    with rate_limit_spans():
+        path = get_route_path(request)
+
+        if user:
+            user_id = user.get("id")
+            tier_id = user.get("tier_id")
+            if tier_id:
+                rules = await service.resolve_rate_limits(tier_id, path)
+                if not rules:
                     logger.warning(
-                        f"User {user_id} with tier '{tier.name}' has no specific rate limit for path '{path}'. "
+                        f"User {user_id} with tier {tier_id} has no specific rate limit for path '{path}'. "
                         f"Applying default rate limit."
                     )
-                    limit, period = get_default_rate_limit(settings)
+                    rules = get_default_rate_limits(settings)
             else:
-                logger.warning(f"User {user_id} has no assigned tier. Applying default rate limit.")
-                limit, period = get_default_rate_limit(settings)
+                logger.warning(f"User {user_id} has no tier_id. Applying default rate limit.")
+                rules = get_default_rate_limits(settings)
         else:
-            logger.warning(f"User {user_id} has no tier_id. Applying default rate limit.")
-            limit, period = get_default_rate_limit(settings)
-    else:
-        user_id = request.client.host if request.client else "unknown"
-        limit, period = get_default_rate_limit(settings)
+            user_id = request.client.host if request.client else "unknown"
+            rules = get_default_rate_limits(settings)
 
-    if user_id is None:
-        user_id = "unknown"
+        if user_id is None:
+            user_id = "unknown"
 
-    is_limited = await rate_limiter.is_rate_limited(user_id=user_id, path=path, limit=limit, period=period)
-    if is_limited:
-        raise RateLimitException("Rate limit exceeded.")
+        decision = await rate_limiter.check(user_id=user_id, path=path, rules=rules)
+        if decision.limited:
+            raise RateLimitException("Rate limit exceeded.", headers=decision.headers())
+        response.headers.update(decision.headers())
 
 
 async def rate_limiter_by_target_dependency(
     request: Request,
+    response: Response,
     target_type: str,
     target_id: str,
     rate_limiter: RateLimiterDep,
@@ -71,30 +83,28 @@ async def rate_limiter_by_target_dependency(
     """Rate limiter dependency that works with any target type (User, App, Tenant, etc.)"""
     if not isinstance(settings, PlansSettings):
         settings = PlansSettings()
-    path = request.url.path
+    with rate_limit_spans():
+        path = get_route_path(request)
 
-    tier_target = await service.get_tier_target(target_type, target_id)
-    if tier_target:
-        rate_limit = await service.get_rate_limit_by_target(target_type, target_id, path)
-        if rate_limit:
-            limit, period = rate_limit.limit, rate_limit.period
-        else:
+        rules = await service.resolve_rate_limits_by_target(target_type, target_id, path)
+        if not rules:
             logger.warning(
-                f"Target {target_type}:{target_id} has no specific rate limit for path '{path}'. "
+                f"Target {target_type}:{target_id} has no active tier or no specific rate limit for path '{path}'. "
                 f"Applying default rate limit."
             )
-            limit, period = get_default_rate_limit(settings)
-    else:
-        logger.warning(f"Target {target_type}:{target_id} has no assigned tier. Applying default rate limit.")
-        limit, period = get_default_rate_limit(settings)
+            rules = get_default_rate_limits(settings)
 
-    is_limited = await rate_limiter.is_rate_limited(
-        user_id=f"{target_type}:{target_id}", path=path, limit=limit, period=period
-    )
-    if is_limited:
-        raise RateLimitException("Rate limit exceeded.")
+        decision = await rate_limiter.check(user_id=f"{target_type}:{target_id}", path=path, rules=rules)
+        if decision.limited:
+            raise RateLimitException("Rate limit exceeded.", headers=decision.headers())
+        response.headers.update(decision.headers())
 
 
 def get_default_rate_limit(settings: PlansSettings) -> tuple[int, int]:
     """Get default rate limit values from settings."""
     return settings.default_rate_limit, settings.default_rate_period
+
+
+def get_default_rate_limits(settings: PlansSettings) -> tuple[RateLimitRule, ...]:
+    """Get the default rate limit as a rule set."""
+    return (RateLimitRule(settings.default_rate_limit, settings.default_rate_period),)
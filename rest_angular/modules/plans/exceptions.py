@@ -17,12 +17,14 @@ class RateLimitException(ApplicationException):
         message: str = "Rate limit exceeded",
         debug: str = "The request rate has exceeded the configured limit for this endpoint",
         extra: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ):
         super().__init__(
             message=message,
             debug=debug,
             extra=extra,
             status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers=headers,
         )
 
 
@@ -122,10 +124,18 @@ class RateLimitAlreadyExistsException(BadRequestException):
         self,
         tier_target_id: int,
         path: str,
+        period: int | None = None,
         extra: dict[str, Any] | None = None,
     ):
-        message = f"Rate limit for tier target {tier_target_id} and path '{path}' already exists"
-        debug = f"Cannot create rate limit for tier target {tier_target_id} and path '{path}' as it already exists"
+        if period is not None:
+            message = f"Rate limit for tier target {tier_target_id}, path '{path}' and period {period}s already exists"
+            debug = (
+                f"Cannot create rate limit for tier target {tier_target_id}, path '{path}' and period {period}s "
+                f"as it already exists"
+            )
+        else:
+            message = f"Rate limit for tier target {tier_target_id} and path '{path}' already exists"
+            debug = f"Cannot create rate limit for tier target {tier_target_id} and path '{path}' as it already exists"
 
         super().__init__(message=message, debug=debug, extra=extra)
 
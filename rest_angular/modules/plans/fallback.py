@@ -0,0 +1,113 @@
+from typing import Annotated, Literal, Sequence
+
+from fastapi import Depends
+from lelab_common import Settings
+
+from ...infra.cache.circuit_breaker import CircuitBreaker
+from .rules import RateLimitDecision, RateLimitRule
+from .settings import PlansSettings
+
+FailureMode = Literal["open", "closed", "local"]
+
+
+class LocalRateLimiter:
+    """
+    In-process fixed window counters, an approximation of the Redis limiter.
+
+    Every worker counts on its own, so a client spread over several workers gets up to
+    the limit from each of them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._counts: dict[str, int] = {}
+        self._window_ends: dict[str, int] = {}
+
+    def check(self, keys: Sequence[str], rules: Sequence[RateLimitRule], now: int) -> list[RateLimitDecision]:
+        if len(self._counts) >= self.max_entries:
+            self._prune(now)
+
+        counts = [self._counts.get(key, 0) for key in keys]
+        limited = any(count >= rule.limit for rule, count in zip(rules, counts))
+        if not limited:
+            for key, rule in zip(keys, rules):
+                self._counts[key] = self._counts.get(key, 0) + 1
+                self._window_ends.setdefault(key, now - now % rule.period + rule.period)
+            counts = [count + 1 for count in counts]
+        return [
+            RateLimitDecision(
+                limited=count >= rule.limit if limited else False,
+                limit=rule.limit,
+                remaining=max(rule.limit - count, 0),
+                reset=rule.period - now % rule.period,
+            )
+            for rule, count in zip(rules, counts)
+        ]
+
+    def _prune(self, now: int) -> None:
+        expired = [key for key, window_end in self._window_ends.items() if window_end <= now]
+        for key in expired:
+            del self._counts[key], self._window_ends[key]
+        if len(self._counts) >= self.max_entries:
+            self._counts.clear()
+            self._window_ends.clear()
+
+
+class RateLimitFallback:
+    """
+    How the rate limiter behaves when Redis is slow or unavailable.
+
+    Redis calls are bounded by ``timeout`` and guarded by a circuit breaker, so while
+    Redis is down requests are decided without waiting on it:
+    - ``open``: every request is allowed
+    - ``closed``: every request is rejected
+    - ``local``: requests are counted by an in-process limiter
+    """
+
+    def __init__(self, mode: FailureMode, timeout: float, breaker: CircuitBreaker, local_limiter: LocalRateLimiter):
+        self.mode = mode
+        self.timeout = timeout
+        self.breaker = breaker
+        self.local_limiter = local_limiter
+
+    def decide(self, keys: Sequence[str], rules: Sequence[RateLimitRule], now: int) -> list[RateLimitDecision]:
+        if self.mode == "local":
+            return self.local_limiter.check(keys, rules, now)
+        limited = self.mode == "closed"
+        return [
+            RateLimitDecision(
+                limited=limited,
+                limit=rule.limit,
+                remaining=0 if limited else rule.limit,
+                reset=rule.period - now % rule.period,
+            )
+            for rule in rules
+        ]
+
+
+_fallback: RateLimitFallback | None = None
+
+
+def get_rate_limit_fallback(settings: Settings) -> RateLimitFallback | None:
+    """Get the worker wide Redis failure handling of the rate limiter, None to raise Redis errors."""
+    if not isinstance(settings, PlansSettings):
+        raise NotImplementedError("The application settings is not inherited from PlansSettings")
+    if settings.rate_limit_failure_mode == "raise":
+        return None
+
+    global _fallback
+    if _fallback is None:
+        _fallback = RateLimitFallback(
+            mode=settings.rate_limit_failure_mode,
+            timeout=settings.rate_limit_redis_timeout_ms / 1000,
+            breaker=CircuitBreaker(
+                "rate-limit-redis",
+                failure_threshold=settings.rate_limit_breaker_failure_threshold,
+                reset_timeout=settings.rate_limit_breaker_reset_timeout,
+            ),
+            local_limiter=LocalRateLimiter(max_entries=settings.rate_limit_local_max_entries),
+        )
+    return _fallback
+
+
+RateLimitFallbackDep = Annotated[RateLimitFallback | None, Depends(get_rate_limit_fallback)]
@@ -0,0 +1,45 @@
+import base64
+import hashlib
+from functools import lru_cache
+
+KEY_PREFIX = "rl"
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def to_base36(value: int) -> str:
+    if value == 0:
+        return "0"
+    digits = []
+    while value:
+        value, digit = divmod(value, 36)
+        digits.append(_DIGITS[digit])
+    return "".join(reversed(digits))
+
+
+@lru_cache(maxsize=4096)
+def path_id(path: str) -> str:
+    """Short stable id of a rate limit path: 8 base64url characters of its BLAKE2b digest."""
+    return base64.urlsafe_b64encode(hashlib.blake2b(path.encode(), digest_size=6).digest()).decode()
+
+
+def counter_key(client: str | int, path: str, period: int, now: int) -> str:
+    """
+    Redis key of a fixed window counter.
+
+    ``rl:{<client>}:<path id>:<period>:<window number>`` with the period and the window
+    number (``now // period``) in base 36. Against the former
+    ``ratelimit:<client>:<path>:<period>:<window start>`` keys this saves the path and
+    most of the timestamp in every key, so one million clients take tens of megabytes
+    less Redis memory, see ``tests/benchmarks/bench_rate_limit_keys.py``.
+
+    The client is a Redis Cluster hash tag: all counters of a client live in the same
+    slot, so the counters of one check are updated by a single node in one transaction.
+
+    :param client: counter owner, the client or a shared scope.
+    :param path: sanitized rate limit path or route template.
+    :param period: window length in seconds.
+    :param now: current timestamp.
+    :return: counter key.
+    """
+    return f"{KEY_PREFIX}:{{{client}}}:{path_id(path)}:{to_base36(period)}:{to_base36(now // period)}"
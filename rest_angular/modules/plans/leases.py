@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from typing import Annotated, Sequence
+
+from fastapi import Depends
+from lelab_common import Settings
+
+from .rules import RateLimitDecision, RateLimitRule
+from .settings import PlansSettings
+
+
+@dataclass(slots=True)
+class TokenLease:
+    """Tokens of one rate limit window reserved in Redis by this worker."""
+
+    tokens: int
+    shared_remaining: int  # tokens left in Redis for all workers when last leased
+    window_end: int
+
+
+class TokenLeaseCache:
+    """
+    Per-worker cache of rate limit tokens leased from Redis.
+
+    Instead of counting each request in Redis, the rate limiter reserves up to
+    ``lease_size`` tokens of a window in one increment and spends them locally, going
+    back to Redis only once the local tokens run out. Tokens are reserved before they
+    are spent, so the limit itself is never exceeded; the price is that tokens held by
+    one worker cannot be used by another, so a client may be rejected up to
+    ``lease_size`` requests per worker early. Unused tokens return to the pool when
+    their window ends and the Redis counter expires, and the reported remaining count
+    may lag behind the shared counter by the tokens other workers hold.
+
+    Only limits of at least ``min_limit`` requests are leased, small limits are counted
+    exactly.
+    """
+
+    def __init__(self, lease_size: int, min_limit: int, max_entries: int):
+        self.lease_size = lease_size
+        self.min_limit = min_limit
+        self.max_entries = max_entries
+        self._leases: dict[str, TokenLease] = {}
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def applies(self, rules: Sequence[RateLimitRule]) -> bool:
+        return all(rule.limit >= self.min_limit for rule in rules)
+
+    def lease_amount(self, rule: RateLimitRule) -> int:
+        return min(self.lease_size, rule.limit)
+
+    def spend(self, keys: Sequence[str], rules: Sequence[RateLimitRule], now: int) -> list[RateLimitDecision] | None:
+        """
+        Spend one local token of every window, if all of them have one left.
+
+        :return: per rule decisions, or None when a window has to be leased from Redis.
+        """
+        leases: list[TokenLease] = []
+        for key in keys:
+            lease = self._leases.get(key)
+            if lease is None or lease.tokens <= 0:
+                return None
+            leases.append(lease)
+
+        for lease in leases:
+            lease.tokens -= 1
+        return [_decision(rule, lease, False, now) for rule, lease in zip(rules, leases)]
+
+    def grant(
+        self,
+        keys: Sequence[str],
+        rules: Sequence[RateLimitRule],
+        counts: Sequence[int],
+        amounts: Sequence[int],
+        now: int,
+    ) -> list[RateLimitDecision]:
+        """
+        Add the tokens leased from Redis and spend one of each window for the current request.
+
+        Of each increment, only the part still below the limit is granted. When a window
+        has no token left the request is rejected and the tokens granted for the other
+        windows are kept for later requests.
+
+        :param keys: counter keys, one per rule.
+        :param rules: rules being enforced.
+        :param counts: counter values after the increment.
+        :param amounts: increments applied to the counters.
+        :param now: current timestamp.
+        :return: per rule decisions.
+        """
+        if len(self._leases) >= self.max_entries:
+            self._prune(now)
+
+        leases: list[TokenLease] = []
+        for key, rule, count, amount in zip(keys, rules, counts, amounts):
+            granted = min(max(rule.limit - (count - amount), 0), amount)
+            lease = self._leases.get(key)
+            if lease is None:
+                lease = self._leases[key] = TokenLease(0, 0, now - now % rule.period + rule.period)
+            lease.tokens += granted
+            lease.shared_remaining = max(rule.limit - count, 0)
+            leases.append(lease)
+
+        limited = [lease.tokens <= 0 for lease in leases]
+        if not any(limited):
+            for lease in leases:
+                lease.tokens -= 1
+        return [_decision(rule, lease, exceeded, now) for rule, lease, exceeded in zip(rules, leases, limited)]
+
+    def _prune(self, now: int) -> None:
+        self._leases = {key: lease for key, lease in self._leases.items() if lease.window_end > now}
+        if len(self._leases) >= self.max_entries:
+            # Dropped tokens stay reserved in Redis until their windows end
+            self._leases.clear()
+
+
+def _decision(rule: RateLimitRule, lease: TokenLease, limited: bool, now: int) -> RateLimitDecision:
+    return RateLimitDecision(
+        limited=limited,
+        limit=rule.limit,
+        remaining=lease.tokens + lease.shared_remaining,
+        reset=rule.period - now % rule.period,
+    )
+
+
+_lease_cache: TokenLeaseCache | None = None
+
+
+def get_token_lease_cache(settings: Settings) -> TokenLeaseCache | None:
+    """Get the worker wide token lease cache, if local token leasing is enabled in settings."""
+    if not isinstance(settings, PlansSettings):
+        raise NotImplementedError("The application settings is not inherited from PlansSettings")
+    if not settings.rate_limit_lease_enabled:
+        return None
+
+    global _lease_cache
+    if _lease_cache is None:
+        _lease_cache = TokenLeaseCache(
+            lease_size=settings.rate_limit_lease_size,
+            min_limit=settings.rate_limit_lease_min_limit,
+            max_entries=settings.rate_limit_lease_max_entries,
+        )
+    return _lease_cache
+
+
+TokenLeaseCacheDep = Annotated[TokenLeaseCache | None, Depends(get_token_lease_cache)]
@@ -0,0 +1,47 @@
+from typing import Iterable
+
+WILDCARD = "*"
+
+
+class PathMatcher:
+    """
+    Precompiled index of rate limit paths, matched against sanitized route templates.
+
+    A path ending in ``*`` is a prefix rule, ``api_users_*`` matches every route below
+    ``/api/users/`` and ``*`` alone matches every route; any other path must equal the
+    route template (e.g. ``api_users_{user_id}``). Candidates are ordered from the most
+    specific: the exact path first, then prefix rules from the longest prefix.
+
+    Candidates are computed once per template and cached; templates come from the
+    application routes, so the cache stays as small as the route table.
+    """
+
+    def __init__(self, paths: Iterable[str], max_cached: int = 10_000):
+        self.max_cached = max_cached
+        self._exact: set[str] = set()
+        prefixes: set[str] = set()
+        for path in paths:
+            if path.endswith(WILDCARD):
+                prefixes.add(path)
+            else:
+                self._exact.add(path)
+        self._prefixes = sorted(prefixes, key=len, reverse=True)
+        self._cache: dict[str, tuple[str, ...]] = {}
+
+    def candidates(self, path: str) -> tuple[str, ...]:
+        """
+        Rate limit paths matching a route template, most specific first.
+
+        :param path: sanitized route template.
+        :return: matching rate limit paths.
+        """
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached
+
+        matches = [path] if path in self._exact else []
+        matches.extend(prefix for prefix in self._prefixes if path.startswith(prefix[:-1]))
+        candidates = tuple(matches)
+        if len(self._cache) < self.max_cached:
+            self._cache[path] = candidates
+        return candidates
@@ -1,7 +1,7 @@
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ...infra.orm.base_model import Base
@@ -26,9 +26,22 @@ class Tier(Base):
 
 class TierTarget(Base):
     __tablename__ = "tier_targets"
+    __table_args__ = (
+        # Rate limit lookups by target only ever match active rows; id and tier_id are
+        # included so the lookup and its join to rate_limits are index-only
+        Index(
+            "ix_tier_targets_active_target",
+            "target_type",
+            "target_id",
+            postgresql_where=text("is_active"),
+            postgresql_include=["id", "tier_id"],
+        ),
+        # Also serves lookups by tier_id alone
+        Index("ix_tier_targets_tier_id_target_type", "tier_id", "target_type"),
+    )
 
     id: Mapped[int] = mapped_column(autoincrement=True, nullable=False, unique=True, primary_key=True)
-    tier_id: Mapped[int] = mapped_column(ForeignKey("tiers.id"), index=True)
+    tier_id: Mapped[int] = mapped_column(ForeignKey("tiers.id"))
     target_type: Mapped[str] = mapped_column(String(1), nullable=False)  # U=User, A=App, T=Tenant, etc.
     target_id: Mapped[str] = mapped_column(String, nullable=False)  # UUID or string identifier for the target
     name: Mapped[str | None] = mapped_column(String, nullable=True)  # Optional descriptive name
@@ -46,18 +59,17 @@ class TierTarget(Base):
     tier: Mapped[Tier] = relationship("Tier", back_populates="tier_targets")
     rate_limits: Mapped[list["RateLimit"]] = relationship("RateLimit", back_populates="tier_target")
 
-    class Meta:
-        indexes = [
-            ("target_type", "target_id"),  # Composite index for efficient lookups
-            ("tier_id", "target_type"),  # Index for tier-based queries
-        ]
-
 
 class RateLimit(Base):
     __tablename__ = "rate_limits"
+    __table_args__ = (
+        # Covering index: (limit, period) for a target and path come from the index alone.
+        # Also serves lookups by tier_target_id alone
+        Index("ix_rate_limits_tier_target_id_path", "tier_target_id", "path", postgresql_include=["limit", "period"]),
+    )
 
     id: Mapped[int] = mapped_column(autoincrement=True, nullable=False, unique=True, primary_key=True)
-    tier_target_id: Mapped[int] = mapped_column(ForeignKey("tier_targets.id"), index=True)
+    tier_target_id: Mapped[int] = mapped_column(ForeignKey("tier_targets.id"))
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     path: Mapped[str] = mapped_column(String, nullable=False)
     limit: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -74,7 +86,11 @@ class RateLimit(Base):
     # Relationships
     tier_target: Mapped[TierTarget] = relationship("TierTarget", back_populates="rate_limits")
 
-    class Meta:
-        indexes = [
-            ("tier_target_id", "path"),
-        ]
+
+class PlansPolicyVersion(Base):
+    """Single row counter bumped by database triggers on every change to tiers, tier targets or rate limits."""
+
+    __tablename__ = "plans_policy_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,7 @@
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, and_, func, literal, or_, select
 
 from ...infra.orm.repository import BaseRepository
 from ...infra.orm.uow import UnitOfWorkDep
@@ -78,30 +78,71 @@ class RateLimitRepository(BaseRepository[RateLimit, int]):
     def __init__(self, uow: UnitOfWorkDep):
         super().__init__(RateLimit, uow)
 
-    async def get_by_tier_target_and_path(
-        self, tier_target_id: int, path: str, eager_load: list[str] | None = None
+    async def get_by_tier_target(self, tier_target_id: int, eager_load: list[str] | None = None) -> list[RateLimit]:
+        stmt = select(self._model_class).where(self._model_class.tier_target_id == tier_target_id)
+        stmt = self._apply_eager_loading(stmt, eager_load)
+        result = await self._execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_by_tier_target_path_and_period(
+        self, tier_target_id: int, path: str, period: int
     ) -> RateLimit | None:
         stmt = select(self._model_class).where(
-            self._model_class.tier_target_id == tier_target_id, self._model_class.path == path
+            self._model_class.tier_target_id == tier_target_id,
+            self._model_class.path == path,
+            self._model_class.period == period,
         )
-        stmt = self._apply_eager_loading(stmt, eager_load)
         result = await self._execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_by_tier_target(self, tier_target_id: int, eager_load: list[str] | None = None) -> list[RateLimit]:
-        stmt = select(self._model_class).where(self._model_class.tier_target_id == tier_target_id)
-        stmt = self._apply_eager_loading(stmt, eager_load)
+    def _matches_path(self, path: str) -> ColumnElement[bool]:
+        """Rate limit paths equal to the route template or prefix rules ("api_users_*") covering it."""
+        return or_(
+            self._model_class.path == path,
+            and_(
+                self._model_class.path.endswith("*"),
+                func.starts_with(literal(path), func.left(self._model_class.path, -1)),
+            ),
+        )
+
+    async def _get_most_specific_limits(
+        self, stmt: Select[tuple[int, int, str]], path: str
+    ) -> list[tuple[int, int, str]]:
+        stmt = stmt.order_by(
+            (self._model_class.path == path).desc(), func.length(self._model_class.path).desc(), self._model_class.id
+        )
         result = await self._execute(stmt)
-        return list(result.scalars().all())
+        rows = list(result.tuples().all())
+        return [row for row in rows if row[2] == rows[0][2]]
+
+    async def get_limits_by_target(self, target_type: str, target_id: str, path: str) -> list[tuple[int, int, str]]:
+        """
+        Get (limit, period, path) rows of the most specific rate limit path matching the route template,
+        for an active target, in one round trip and without loading entities.
+        """
+        stmt = (
+            select(self._model_class.limit, self._model_class.period, self._model_class.path)
+            .join(TierTarget)
+            .where(
+                TierTarget.target_type == target_type,
+                TierTarget.target_id == target_id,
+                TierTarget.is_active == True,
+                self._matches_path(path),
+            )
+        )
+        return await self._get_most_specific_limits(stmt, path)
 
-    async def get_by_tier_and_path(self, tier_id: int, path: str) -> RateLimit | None:
+    async def get_limits_by_tier(self, tier_id: int, path: str) -> list[tuple[int, int, str]]:
+        """
+        Get (limit, period, path) rows of the most specific rate limit path matching the route template,
+        for a tier, in one round trip and without loading entities.
+        """
         stmt = (
-            select(self._model_class)
+            select(self._model_class.limit, self._model_class.period, self._model_class.path)
             .join(TierTarget)
-            .where(TierTarget.tier_id == tier_id, self._model_class.path == path)
+            .where(TierTarget.tier_id == tier_id, self._matches_path(path))
         )
-        result = await self._execute(stmt)
-        return result.scalar_one_or_none()
+        return await self._get_most_specific_limits(stmt, path)
 
 
 RateLimitRepositoryDep = Annotated[RateLimitRepository, Depends()]
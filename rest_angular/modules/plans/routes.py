@@ -259,9 +259,11 @@ async def create_rate_limit(
     tier_target_id: int,
     repo: RateLimitRepositoryDep,
 ):
-    existing_rate_limit = await repo.get_by_tier_target_and_path(tier_target_id, rate_limit_data.path)
+    existing_rate_limit = await repo.get_by_tier_target_path_and_period(
+        tier_target_id, rate_limit_data.path, rate_limit_data.period
+    )
     if existing_rate_limit:
-        raise RateLimitAlreadyExistsException(tier_target_id, rate_limit_data.path)
+        raise RateLimitAlreadyExistsException(tier_target_id, rate_limit_data.path, rate_limit_data.period)
 
     new_rate_limit = RateLimit(**rate_limit_data.model_dump(), tier_target_id=tier_target_id)
     new_rate_limit = await repo.add(new_rate_limit, flush=True)
@@ -286,10 +288,16 @@ async def update_rate_limit(
     if not rate_limit:
         raise RateLimitNotFoundException()
 
-    if rate_limit_data.path is not None:
-        existing_rate_limit = await repo.get_by_tier_target_and_path(rate_limit.tier_target_id, rate_limit_data.path)
+    if rate_limit_data.path is not None or rate_limit_data.period is not None:
+        check_path = rate_limit_data.path or rate_limit.path
+        check_period = rate_limit_data.period or rate_limit.period
+        existing_rate_limit = await repo.get_by_tier_target_path_and_period(
+            rate_limit.tier_target_id, check_path, check_period
+        )
         if existing_rate_limit and existing_rate_limit.id != rate_limit_id:
-            raise RateLimitAlreadyExistsException(rate_limit.tier_target_id, rate_limit_data.path)
+            raise RateLimitAlreadyExistsException(rate_limit.tier_target_id, check_path, check_period)
+
+    if rate_limit_data.path is not None:
         rate_limit.path = rate_limit_data.path
 
     if rate_limit_data.limit is not None:
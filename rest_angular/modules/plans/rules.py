@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """
+    A single fixed window enforced by the rate limiter.
+
+    ``scope`` names the counter owner and defaults to the limited client; rules sharing a
+    scope across clients (e.g. ``"T:<tenant id>"``) enforce an aggregate limit. ``path``
+    is the rate limit path the rule was configured for and defaults to the requested
+    route; a prefix rule counts all the routes it matches together.
+    """
+
+    limit: int
+    period: int
+    scope: str | None = None
+    path: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """Outcome of checking a set of rules, reported for the most restrictive rule."""
+
+    limited: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the deciding window resets
+
+    def headers(self) -> dict[str, str]:
+        """RateLimit-* response headers, plus Retry-After when the request is rejected."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+        }
+        if self.limited:
+            headers["Retry-After"] = str(self.reset)
+        return headers
+
+
+def to_rules(rows: Iterable[tuple[int, int, str]]) -> tuple[RateLimitRule, ...]:
+    """
+    Build rules from (limit, period, path) rows, keeping the first row for each period.
+
+    :param rows: rate limit rows in priority order.
+    :return: rules, empty when no row matched.
+    """
+    rules: dict[int, RateLimitRule] = {}
+    for limit, period, path in rows:
+        rules.setdefault(period, RateLimitRule(limit, period, path=path))
+    return tuple(rules.values())
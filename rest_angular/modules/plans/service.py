@@ -1,41 +1,152 @@
-from datetime import UTC, datetime
-from typing import Annotated
+import asyncio
+import logging
+from time import perf_counter, time
+from typing import Annotated, Sequence
 
 from fastapi import Depends
+from redis.asyncio import RedisCluster
 
 from ...infra.cache.redis import RedisClient
-from .models import RateLimit, Tier, TierTarget
+from ...infra.monitor.metrics import rate_limit_decisions, rate_limit_redis_duration
+from .fallback import RateLimitFallback, RateLimitFallbackDep
+from .keys import counter_key
+from .leases import TokenLeaseCacheDep
 from .repository import (
     RateLimitRepositoryDep,
     TierRepositoryDep,
     TierTargetRepositoryDep,
 )
+from .rules import RateLimitDecision, RateLimitRule, to_rules
 from .schemas import sanitize_path
+from .snapshot import get_policy_snapshot
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    def __init__(self, redis_client: RedisClient):
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        lease_cache: TokenLeaseCacheDep = None,
+        fallback: RateLimitFallbackDep = None,
+    ):
         self.client = redis_client
-
-    async def is_rate_limited(self, user_id: str | int, path: str, limit: int, period: int) -> bool:
-        current_timestamp = int(datetime.now(UTC).timestamp())
-        window_start = current_timestamp - (current_timestamp % period)
-
+        self.lease_cache = lease_cache
+        self.fallback = fallback
+
+    async def check(self, user_id: str | int, path: str, rules: Sequence[RateLimitRule]) -> RateLimitDecision:
+        """
+        Count a request against every rule in a single Redis round trip.
+
+        The counters of all rules are incremented in one transactional pipeline, so adding
+        rules does not add round trips. A rejected request is still counted by every rule,
+        so bursts rejected by a short window also use up the longer windows' quotas.
+
+        On a Redis Cluster, counters are hash tagged by client and stay in one slot. Only
+        rules with different scopes span several slots, and those are sent as a plain
+        pipeline, one request per node.
+
+        With a token lease cache, requests are served from tokens leased earlier by this
+        worker and Redis is only called to lease more, see ``TokenLeaseCache``.
+
+        With a fallback, Redis calls are bounded by a timeout and a circuit breaker, and
+        requests are decided by the configured failure mode while Redis is unavailable,
+        see ``RateLimitFallback``. Without one, Redis errors are raised.
+
+        :param user_id: limited client.
+        :param path: requested route template, counted unless a rule names its own path.
+        :param rules: rules to enforce, at least one.
+        :return: the decision of the most restrictive rule.
+        """
+        if not rules:
+            raise ValueError("At least one rate limit rule is required")
+        now = int(time())
         sanitized_path = sanitize_path(path)
-        key = f"ratelimit:{user_id}:{sanitized_path}:{window_start}"
-
+        keys = [counter_key(rule.scope or user_id, rule.path or sanitized_path, rule.period, now) for rule in rules]
+
+        lease_cache = self.lease_cache if self.lease_cache is not None and self.lease_cache.applies(rules) else None
+        if lease_cache is not None:
+            leased = lease_cache.spend(keys, rules, now)
+            if leased is not None:
+                rate_limit_decisions.add(1, {"decision": "allowed"})
+                return _most_restrictive(leased)
+            amounts = [lease_cache.lease_amount(rule) for rule in rules]
+        else:
+            amounts = [1] * len(rules)
+
+        fallback = self.fallback
+        if fallback is not None and not fallback.breaker.allow():
+            return self._fallback_decision(fallback, keys, rules, now)
+
+        started_at = perf_counter()
         try:
-            current_count = await self.client.incr(key)
-            if current_count == 1:
-                await self.client.expire(key, period)
+            async with asyncio.timeout(fallback.timeout if fallback is not None else None):
+                async with self.client.pipeline(transaction=self._transactional(rules, user_id)) as pipe:
+                    for key, rule, amount in zip(keys, rules, amounts):
+                        pipe.incrby(key, amount)
+                        pipe.expire(key, rule.period, nx=True)
+                    counts: list[int] = (await pipe.execute())[::2]
+        except Exception as e:
+            if fallback is None:
+                rate_limit_decisions.add(1, {"decision": "error"})
+                raise
+            logger.warning(f"Rate limiter Redis call failed, applying the '{fallback.mode}' failure mode: {e!r}")
+            fallback.breaker.record_failure()
+            return self._fallback_decision(fallback, keys, rules, now)
+        finally:
+            rate_limit_redis_duration.record((perf_counter() - started_at) * 1000)
+        if fallback is not None:
+            fallback.breaker.record_success()
+
+        if lease_cache is not None:
+            # Tokens leased for windows that were not exceeded are kept for later requests
+            decision = _most_restrictive(lease_cache.grant(keys, rules, counts, amounts, now))
+            rate_limit_decisions.add(1, {"decision": "rejected" if decision.limited else "allowed"})
+            return decision
+
+        decision = _most_restrictive(
+            [
+                RateLimitDecision(
+                    limited=count > rule.limit,
+                    limit=rule.limit,
+                    remaining=max(rule.limit - count, 0),
+                    reset=rule.period - now % rule.period,
+                )
+                for rule, count in zip(rules, counts)
+            ]
+        )
+        rate_limit_decisions.add(1, {"decision": "rejected" if decision.limited else "allowed"})
+        return decision
+
+    def _transactional(self, rules: Sequence[RateLimitRule], user_id: str | int) -> bool:
+        """Cluster transactions must stay in one slot, i.e. count a single client."""
+        if not isinstance(self.client, RedisCluster):
+            return True
+        return len({rule.scope or user_id for rule in rules}) == 1
+
+    def _fallback_decision(
+        self, fallback: RateLimitFallback, keys: Sequence[str], rules: Sequence[RateLimitRule], now: int
+    ) -> RateLimitDecision:
+        decision = _most_restrictive(fallback.decide(keys, rules, now))
+        rate_limit_decisions.add(
+            1, {"decision": "rejected" if decision.limited else "allowed", "fallback": fallback.mode}
+        )
+        return decision
 
-            if current_count > limit:
-                return True
+    async def is_rate_limited(self, user_id: str | int, path: str, limit: int, period: int) -> bool:
+        decision = await self.check(user_id, path, (RateLimitRule(limit, period),))
+        return decision.limited
 
-        except Exception as e:
-            raise e
 
-        return False
+def _most_restrictive(decisions: Sequence[RateLimitDecision]) -> RateLimitDecision:
+    """
+    Pick the deciding rule: when rejected, the exceeded rule resetting last, otherwise
+    the rule with the fewest remaining requests.
+    """
+    exceeded = [decision for decision in decisions if decision.limited]
+    if exceeded:
+        return max(exceeded, key=lambda decision: decision.reset)
+    return min(decisions, key=lambda decision: (decision.remaining, -decision.reset))
 
 
 class PlansService:
@@ -49,20 +160,39 @@ class PlansService:
         self.rate_limit_repo = rate_limit_repo
         self.tier_target_repo = tier_target_repo
 
-    async def get_tier(self, tier_id: int) -> Tier | None:
-        return await self.tier_repo.get_by_id(tier_id)
+    async def resolve_rate_limits_by_target(
+        self, target_type: str, target_id: str, path: str
+    ) -> tuple[RateLimitRule, ...]:
+        """
+        Resolve the rules applying to a target and route template with a single query.
+
+        The most specific matching rate limit path wins: the template itself, then the
+        longest prefix rule.
+
+        Served from the in-memory policy snapshot without a query when it is enabled.
+
+        :return: one rule per configured period, empty when the default rate limit applies.
+        """
+        snapshot = get_policy_snapshot()
+        if snapshot is not None:
+            return snapshot.get_by_target(target_type, target_id, path)
+        return to_rules(await self.rate_limit_repo.get_limits_by_target(target_type, target_id, path))
+
+    async def resolve_rate_limits(self, tier_id: int, path: str) -> tuple[RateLimitRule, ...]:
+        """
+        Resolve the rules applying to a tier and route template with a single query.
 
-    async def get_tier_target(self, target_type: str, target_id: str) -> TierTarget | None:
-        return await self.tier_target_repo.get_by_target(target_type, target_id)
+        The most specific matching rate limit path wins: the template itself, then the
+        longest prefix rule.
 
-    async def get_rate_limit_by_target(self, target_type: str, target_id: str, path: str) -> RateLimit | None:
-        tier_target = await self.tier_target_repo.get_by_target(target_type, target_id)
-        if not tier_target:
-            return None
-        return await self.rate_limit_repo.get_by_tier_target_and_path(tier_target.id, path)
+        Served from the in-memory policy snapshot without a query when it is enabled.
 
-    async def get_rate_limit(self, tier_id: int, path: str) -> RateLimit | None:
-        return await self.rate_limit_repo.get_by_tier_and_path(tier_id, path)
+        :return: one rule per configured period, empty when the default rate limit applies.
+        """
+        snapshot = get_policy_snapshot()
+        if snapshot is not None:
+            return snapshot.get_by_tier(tier_id, path)
+        return to_rules(await self.rate_limit_repo.get_limits_by_tier(tier_id, path))
 
 
 RateLimiterDep = Annotated[RateLimiter, Depends()]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,3 +9,20 @@ class PlansSettings(BaseSettings):
     # Default rate limit values
     default_rate_limit: int = 100
     default_rate_period: int = 3600  # 1 hour in seconds
+
+    # In-memory policy snapshot
+    policy_snapshot_enabled: bool = False
+    policy_snapshot_refresh_interval: float = 5.0  # seconds between version checks
+
+    # Local token leases
+    rate_limit_lease_enabled: bool = False
+    rate_limit_lease_size: int = 10  # tokens leased from Redis per round trip
+    rate_limit_lease_min_limit: int = 100  # smaller limits are always counted in Redis
+    rate_limit_lease_max_entries: int = 100_000
+
+    # Redis failure handling: raise the error ("raise"), allow ("open"), reject ("closed") or count in process ("local")
+    rate_limit_failure_mode: Literal["raise", "open", "closed", "local"] = "raise"
+    rate_limit_redis_timeout_ms: int = 50
+    rate_limit_breaker_failure_threshold: int = 5  # consecutive failures opening the circuit
+    rate_limit_breaker_reset_timeout: float = 10.0  # seconds before Redis is tried again
+    rate_limit_local_max_entries: int = 100_000
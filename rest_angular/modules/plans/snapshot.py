@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from lelab_common import Settings
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...infra.orm.sa import get_async_session_factory
+from .matching import PathMatcher
+from .models import PlansPolicyVersion, RateLimit, TierTarget
+from .rules import RateLimitRule
+from .settings import PlansSettings
+
+logger = logging.getLogger(__name__)
+
+Rules = tuple[RateLimitRule, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PolicySnapshot:
+    """
+    Immutable in-memory copy of every rate limit policy.
+
+    Lookups are dict accesses over the paths the route template matches, and never
+    touch the database; a newer policy version replaces the whole snapshot instead of
+    mutating it.
+    """
+
+    version: int
+    by_target: Mapping[tuple[str, str, str], Rules]
+    by_tier: Mapping[tuple[int, str], Rules]
+    matcher: PathMatcher
+
+    def get_by_target(self, target_type: str, target_id: str, path: str) -> Rules:
+        for candidate in self.matcher.candidates(path):
+            rules = self.by_target.get((target_type, target_id, candidate))
+            if rules:
+                return rules
+        return ()
+
+    def get_by_tier(self, tier_id: int, path: str) -> Rules:
+        for candidate in self.matcher.candidates(path):
+            rules = self.by_tier.get((tier_id, candidate))
+            if rules:
+                return rules
+        return ()
+
+
+async def _read_version(session: AsyncSession) -> int:
+    result = await session.execute(select(PlansPolicyVersion.version))
+    return result.scalar_one_or_none() or 0
+
+
+async def _load_snapshot(session: AsyncSession, version: int) -> PolicySnapshot:
+    stmt = (
+        select(
+            TierTarget.target_type,
+            TierTarget.target_id,
+            TierTarget.tier_id,
+            TierTarget.is_active,
+            RateLimit.path,
+            RateLimit.limit,
+            RateLimit.period,
+        )
+        .join(RateLimit, RateLimit.tier_target_id == TierTarget.id)
+        .order_by(RateLimit.id)
+    )
+    by_target: dict[tuple[str, str, str], dict[int, RateLimitRule]] = {}
+    by_tier: dict[tuple[int, str], dict[int, RateLimitRule]] = {}
+    # Most policies share a handful of (limit, period, path) triples, keep one rule object per triple
+    rules_pool: dict[tuple[int, int, str], RateLimitRule] = {}
+    for target_type, target_id, tier_id, is_active, path, limit, period in await session.execute(stmt):
+        rule = rules_pool.get((limit, period, path)) or rules_pool.setdefault(
+            (limit, period, path), RateLimitRule(limit, period, path=path)
+        )
+        # Same semantics as the database lookups: first row per period wins, targets must be active
+        if is_active:
+            by_target.setdefault((target_type, target_id, path), {}).setdefault(period, rule)
+        by_tier.setdefault((tier_id, path), {}).setdefault(period, rule)
+    return PolicySnapshot(
+        version,
+        MappingProxyType({key: tuple(rules.values()) for key, rules in by_target.items()}),
+        MappingProxyType({key: tuple(rules.values()) for key, rules in by_tier.items()}),
+        PathMatcher(path for _, path in by_tier),
+    )
+
+
+class PolicySnapshotStore:
+    """
+    Holder of the current policy snapshot, refreshed in the background.
+
+    Every refresh interval the policy version counter is read; only when it changed is
+    the policy graph reloaded, in the same repeatable read transaction so the version
+    and rows are consistent. The new snapshot is swapped in with a single assignment,
+    requests see either the old or the new snapshot, never a mix.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], refresh_interval: float):
+        self._session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.snapshot: PolicySnapshot | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> bool:
+        """
+        Reload the snapshot if the policy version changed.
+
+        :return: whether a new snapshot was loaded.
+        """
+        async with self._session_factory() as session:
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            version = await _read_version(session)
+            if self.snapshot is not None and self.snapshot.version == version:
+                return False
+            snapshot = await _load_snapshot(session, version)
+
+        self.snapshot = snapshot
+        logger.info(
+            f"Loaded rate limit policy snapshot version {version}: "
+            f"{len(snapshot.by_target)} target and {len(snapshot.by_tier)} tier limits"
+        )
+        return True
+
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # Lookups fall back to the database until a refresh succeeds
+            logger.exception("Failed to load the rate limit policy snapshot")
+        self._task = asyncio.create_task(self._run(), name="policy-snapshot-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh the rate limit policy snapshot, keeping the previous one")
+
+
+_policy_snapshot_store: PolicySnapshotStore | None = None
+
+
+async def start_policy_snapshot(settings: Settings) -> None:
+    """
+    Load the rate limit policy snapshot and start refreshing it, if enabled in settings.
+
+    :param settings: application settings.
+    """
+    if not isinstance(settings, PlansSettings):
+        raise NotImplementedError("The application settings is not inherited from PlansSettings")
+    if not settings.policy_snapshot_enabled:
+        return
+
+    global _policy_snapshot_store
+    if _policy_snapshot_store is None:
+        _policy_snapshot_store = PolicySnapshotStore(
+            get_async_session_factory(settings), settings.policy_snapshot_refresh_interval
+        )
+        await _policy_snapshot_store.start()
+
+
+async def stop_policy_snapshot() -> None:
+    """Stop refreshing the rate limit policy snapshot and drop it."""
+    global _policy_snapshot_store
+    if _policy_snapshot_store is not None:
+        store, _policy_snapshot_store = _policy_snapshot_store, None
+        await store.stop()
+
+
+def get_policy_snapshot() -> PolicySnapshot | None:
+    """Get the current rate limit policy snapshot, if the snapshot mode is enabled and loaded."""
+    return _policy_snapshot_store.snapshot if _policy_snapshot_store is not None else None
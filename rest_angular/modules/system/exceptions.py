@@ -0,0 +1,25 @@
+from typing import Any
+
+from lelab_common.exceptions import BadRequestException
+
+
+class ProfilingAlreadyRunningException(BadRequestException):
+    """Exception raised when starting a profiling session while another one is running"""
+
+    def __init__(self, extra: dict[str, Any] | None = None):
+        super().__init__(
+            message="A profiling session is already running",
+            debug="Stop the running profiling session before starting a new one",
+            extra=extra,
+        )
+
+
+class ProfilingNotRunningException(BadRequestException):
+    """Exception raised when stopping a profiling session that was not started"""
+
+    def __init__(self, extra: dict[str, Any] | None = None):
+        super().__init__(
+            message="No profiling session is running",
+            debug="Start a profiling session before stopping it",
+            extra=extra,
+        )
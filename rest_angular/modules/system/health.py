@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import Any, Awaitable, Callable
+
+from lelab_common import Settings
+from redis.asyncio import Redis
+from sqlalchemy import QueuePool, text
+
+from ...infra.bus.settings import KafkaSettings
+from ...infra.cache.redis import get_redis_cluster, get_redis_pool
+from ...infra.cache.settings import RedisSettings
+from ...infra.orm.sa import get_database_engine
+from .settings import SystemSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    """
+    Outcome of a single dependency probe.
+
+    ``error`` is a generic reason (``timeout``, ``unavailable``) safe to expose on the
+    unauthenticated readiness endpoint, the exception itself is only logged.
+    """
+
+    healthy: bool
+    latency_ms: float
+    error: str | None = None
+    pool: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"status": "up" if self.healthy else "down", "latency_ms": round(self.latency_ms, 3)}
+        if self.error is not None:
+            result["error"] = self.error
+        if self.pool:
+            result["pool"] = self.pool
+        return result
+
+
+def _saturation(in_use: int, capacity: int | None) -> float | None:
+    if not capacity:
+        return None
+    return round(in_use / capacity, 3)
+
+
+class HealthChecker:
+    """
+    Probes the database, Redis and Kafka and caches the outcome for ``cache_ttl`` seconds.
+
+    Concurrent readiness requests share a single in-flight check, so probes from several
+    load balancers never multiply the load on the dependencies. Each probe is bounded by
+    ``timeout`` seconds. Besides connectivity, the database and Redis probes report how
+    saturated their connection pools are; the application is reported as not ready once
+    a pool reaches ``saturation_threshold``, so traffic is shed before it queues up.
+    """
+
+    def __init__(self, settings: Settings):
+        if not isinstance(settings, SystemSettings):
+            raise NotImplementedError("The application settings is not inherited from SystemSettings")
+        self.settings = settings
+        self.timeout = settings.health_probe_timeout_ms / 1000
+        self.cache_ttl = settings.health_probe_cache_ttl
+        self.saturation_threshold = settings.health_pool_saturation_threshold
+        self._probes: dict[str, Callable[[], Awaitable[ProbeResult]]] = {
+            "database": self._probe_database,
+            "redis": self._probe_redis,
+        }
+        self._kafka_servers: list[str] = []
+        if settings.health_check_kafka and isinstance(settings, KafkaSettings):
+            self._kafka_servers = [server.strip() for server in settings.kafka_bootstrap_servers.split(",")]
+            self._probes["kafka"] = self._probe_kafka
+        self._cached: tuple[float, dict[str, ProbeResult]] | None = None
+        self._in_flight: asyncio.Future[dict[str, ProbeResult]] | None = None
+
+    async def check(self) -> dict[str, ProbeResult]:
+        """
+        Run all probes, or return the cached results if they are recent enough.
+
+        :return: probe results by dependency name.
+        """
+        if self._cached is not None and monotonic() - self._cached[0] < self.cache_ttl:
+            return self._cached[1]
+        if self._in_flight is not None:
+            return await asyncio.shield(self._in_flight)
+
+        self._in_flight = asyncio.ensure_future(self._run_probes())
+        try:
+            results = await asyncio.shield(self._in_flight)
+        finally:
+            self._in_flight = None
+        self._cached = (monotonic(), results)
+        return results
+
+    def is_ready(self, results: dict[str, ProbeResult]) -> bool:
+        """Whether every dependency is reachable and no pool is saturated."""
+        for result in results.values():
+            if not result.healthy:
+                return False
+            saturation = result.pool.get("saturation")
+            if saturation is not None and saturation >= self.saturation_threshold:
+                return False
+        return True
+
+    async def _run_probes(self) -> dict[str, ProbeResult]:
+        names = list(self._probes)
+        results = await asyncio.gather(*(self._timed(name, self._probes[name]) for name in names))
+        return dict(zip(names, results))
+
+    async def _timed(self, name: str, probe: Callable[[], Awaitable[ProbeResult]]) -> ProbeResult:
+        started_at = perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                result = await probe()
+        except TimeoutError:
+            logger.warning(f"Health probe '{name}' timed out after {self.timeout}s")
+            result = ProbeResult(healthy=False, latency_ms=0.0, error="timeout")
+        except Exception as e:
+            logger.warning(f"Health probe '{name}' failed: {e!r}")
+            result = ProbeResult(healthy=False, latency_ms=0.0, error="unavailable")
+        result.latency_ms = (perf_counter() - started_at) * 1000
+        return result
+
+    async def _probe_database(self) -> ProbeResult:
+        engine = get_database_engine(self.settings)
+        pool = engine.sync_engine.pool
+        pool_stats: dict[str, Any] = {}
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            in_use = pool.checkedout()
+            pool_stats = {"in_use": in_use, "capacity": capacity, "saturation": _saturation(in_use, capacity)}
+
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        return ProbeResult(healthy=True, latency_ms=0.0, pool=pool_stats)
+
+    async def _probe_redis(self) -> ProbeResult:
+        if isinstance(self.settings, RedisSettings) and self.settings.redis_cluster:
+            return await self._probe_redis_cluster()
+
+        pool = get_redis_pool(self.settings)
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        capacity = pool.max_connections if pool.max_connections < 2**31 else None
+        pool_stats = {"in_use": in_use, "capacity": capacity, "saturation": _saturation(in_use, capacity)}
+
+        client = Redis(connection_pool=pool)
+        try:
+            await client.ping()
+        finally:
+            await client.aclose()
+        return ProbeResult(healthy=True, latency_ms=0.0, pool=pool_stats)
+
+    async def _probe_redis_cluster(self) -> ProbeResult:
+        """The per-node pools of the cluster client expose no usage, only reachability is reported."""
+        await get_redis_cluster(self.settings).ping()
+        return ProbeResult(healthy=True, latency_ms=0.0)
+
+    async def _probe_kafka(self) -> ProbeResult:
+        """Kafka is reachable when any bootstrap server accepts a TCP connection."""
+        last_error: Exception | None = None
+        for server in self._kafka_servers:
+            host, _, port = server.rpartition(":")
+            try:
+                _, writer = await asyncio.open_connection(host, int(port))
+            except OSError as e:
+                last_error = e
+                continue
+            writer.close()
+            await writer.wait_closed()
+            return ProbeResult(healthy=True, latency_ms=0.0)
+        logger.warning(f"Health probe 'kafka' failed, no bootstrap server reachable: {last_error!r}")
+        return ProbeResult(healthy=False, latency_ms=0.0, error="unavailable")
+
+
+_health_checker: HealthChecker | None = None
+
+
+def get_health_checker(settings: Settings) -> HealthChecker:
+    """Get the health checker shared by all readiness requests."""
+    global _health_checker
+    if _health_checker is None:
+        _health_checker = HealthChecker(settings)
+    return _health_checker
@@ -0,0 +1,83 @@
+import sys
+import threading
+from collections import Counter
+from time import monotonic
+from types import FrameType
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stack of a single thread from a background thread.
+
+    Samples are aggregated as collapsed stacks (``root;...;leaf count``), the input
+    format of flamegraph.pl, speedscope and similar tools. Sampling stops by itself
+    after ``max_duration`` seconds so a forgotten session does not keep running.
+    """
+
+    def __init__(self, interval: float = 0.01, max_duration: float = 300.0):
+        self.interval = interval
+        self.max_duration = max_duration
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def finished(self) -> bool:
+        """Sampling stopped by itself after ``max_duration``, the samples are kept until ``stop``."""
+        return self._thread is not None and not self._thread.is_alive()
+
+    def start(self, thread_id: int | None = None) -> None:
+        """
+        Start sampling.
+
+        :param thread_id: thread to sample, defaults to the calling thread.
+        """
+        if self.running:
+            return
+        target_thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._sample, args=(target_thread_id,), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        """
+        Stop sampling.
+
+        :return: collected samples as collapsed stacks, one stack per line.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """Collected samples as collapsed stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _sample(self, target_thread_id: int) -> None:
+        deadline = monotonic() + self.max_duration
+        while not self._stopped.wait(self.interval) and monotonic() < deadline:
+            frame = sys._current_frames().get(target_thread_id)
+            if frame is None:
+                continue
+            labels: list[str] = []
+            current: FrameType | None = frame
+            while current is not None:
+                labels.append(_frame_label(current))
+                current = current.f_back
+            labels.reverse()
+            self._stacks[";".join(labels)] += 1
+            self.samples += 1
@@ -0,0 +1,112 @@
+import asyncio
+from time import time
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from lelab_common import Settings
+
+from ...infra.monitor.loop_monitor import LoopMonitor, get_loop_monitor
+from ..users.user_routes import api_users
+from .exceptions import ProfilingAlreadyRunningException, ProfilingNotRunningException
+from .profiler import SamplingProfiler
+from .settings import SystemSettings
+
+router = APIRouter(
+    prefix="/system/profiling",
+    tags=["system"],
+    dependencies=[Depends(api_users.current_user(active=True, superuser=True))],
+)
+
+_profiler: SamplingProfiler | None = None
+_loop_monitor: LoopMonitor | None = None
+
+
+@router.post("/start", name="start_profiling")
+async def start_profiling(settings: Settings) -> dict[str, Any]:
+    """
+    Start sampling the event loop thread and monitoring event loop lag.
+
+    :return: profiling session parameters.
+    """
+    if not isinstance(settings, SystemSettings):
+        raise NotImplementedError("The application settings is not inherited from SystemSettings")
+
+    global _profiler, _loop_monitor
+    if _profiler is not None and _profiler.running:
+        raise ProfilingAlreadyRunningException()
+    # A session that reached its maximum duration is replaced, its samples are discarded
+
+    _profiler = SamplingProfiler(
+        interval=settings.profiling_sample_interval_ms / 1000,
+        max_duration=settings.profiling_max_duration,
+    )
+    # Called from the event loop thread, so that is the thread being sampled
+    _profiler.start()
+
+    # Only monitor the loop for this session when the application wide monitor is disabled
+    if get_loop_monitor() is None:
+        if _loop_monitor is not None:
+            await _loop_monitor.stop()
+        _loop_monitor = LoopMonitor(slow_callback_threshold=settings.profiling_slow_callback_threshold_ms / 1000)
+        _loop_monitor.start()
+
+    return {
+        "status": "started",
+        "sample_interval_ms": settings.profiling_sample_interval_ms,
+        "max_duration": settings.profiling_max_duration,
+    }
+
+
+@router.post("/stop", name="stop_profiling", response_class=PlainTextResponse)
+async def stop_profiling() -> PlainTextResponse:
+    """
+    Stop the profiling session.
+
+    :return: collapsed stacks file, loadable by flamegraph.pl or speedscope.
+    """
+    global _profiler
+    if _profiler is None:
+        raise ProfilingNotRunningException()
+
+    # A session that reached its maximum duration can still be stopped to collect its samples
+
+    profiler, _profiler = _profiler, None
+    collapsed = await asyncio.to_thread(profiler.stop)
+    if _loop_monitor is not None:
+        # Keep the monitor around so its report stays available after the session
+        await _loop_monitor.stop()
+
+    return PlainTextResponse(
+        collapsed,
+        headers={"Content-Disposition": f'attachment; filename="profile-{int(time())}.collapsed"'},
+    )
+
+
+@router.get("/status", name="get_profiling_status")
+async def get_profiling_status() -> dict[str, Any]:
+    """
+    State of the profiling session.
+
+    :return: ``idle`` without a session, ``running`` while sampling, ``finished`` once the
+        session reached its maximum duration and waits to be stopped.
+    """
+    if _profiler is None:
+        return {"status": "idle"}
+    return {"status": "running" if _profiler.running else "finished", "samples": _profiler.samples}
+
+
+@router.get("/loop", name="get_loop_report")
+async def get_loop_report() -> dict[str, Any]:
+    """
+    Event loop lag statistics and slow callbacks.
+
+    Reported by the application wide monitor, or by the current or last profiling
+    session when that monitor is disabled.
+
+    :return: loop monitor report.
+    """
+    loop_monitor = get_loop_monitor() or _loop_monitor
+    if loop_monitor is None:
+        raise ProfilingNotRunningException()
+    return loop_monitor.report()
@@ -1,6 +1,12 @@
 from typing import Any
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from lelab_common import Settings
+from starlette import status
+
+from ...infra.monitor.loop_monitor import get_loop_monitor
+from .health import get_health_checker
 
 router = APIRouter()
 
@@ -13,3 +19,42 @@ async def health_check() -> dict[str, str]:
     :return: health status.
     """
     return {"status": "ok"}
+
+
+@router.get("/health/live", name="liveness_check")
+async def liveness_check() -> dict[str, Any]:
+    """
+    Liveness probe, does not touch any dependency.
+
+    Answering at all shows the event loop is running; the last measured loop lag is
+    included when the loop monitor is enabled.
+
+    :return: liveness status.
+    """
+    result: dict[str, Any] = {"status": "ok"}
+    loop_monitor = get_loop_monitor()
+    if loop_monitor is not None:
+        result["loop_lag_ms"] = round(loop_monitor.last_lag_ms, 3)
+    return result
+
+
+@router.get("/health/ready", name="readiness_check")
+async def readiness_check(settings: Settings) -> JSONResponse:
+    """
+    Readiness probe checking the database, Redis and Kafka.
+
+    Probe results are cached for a few seconds. Responds with 503 when a dependency
+    is down or a connection pool is saturated.
+
+    :return: readiness status with the result of each probe.
+    """
+    health_checker = get_health_checker(settings)
+    results = await health_checker.check()
+    ready = health_checker.is_ready(results)
+    return JSONResponse(
+        {
+            "status": "ready" if ready else "not_ready",
+            "checks": {name: result.to_dict() for name, result in results.items()},
+        },
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
@@ -0,0 +1,26 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class SystemSettings(BaseSettings):
+    """Settings for the system module."""
+
+    # Profiling endpoints, admin only
+    profiling_enabled: bool = Field(default=False, description="Expose the admin profiling endpoints")
+    profiling_sample_interval_ms: int = Field(default=10, ge=1, description="Milliseconds between profiler samples")
+    profiling_max_duration: int = Field(
+        default=300, gt=0, description="Seconds after which a profiling session stops sampling"
+    )
+    profiling_slow_callback_threshold_ms: int = Field(
+        default=100, gt=0, description="Event loop blocking time reported as a slow callback while profiling"
+    )
+
+    # Readiness probes
+    health_probe_timeout_ms: int = Field(default=1000, gt=0, description="Timeout of each readiness dependency probe")
+    health_probe_cache_ttl: float = Field(
+        default=5.0, ge=0, description="Seconds readiness probe results are reused before probing again"
+    )
+    health_pool_saturation_threshold: float = Field(
+        default=0.95, gt=0, le=1, description="Connection pool usage ratio at which the application reports not ready"
+    )
+    health_check_kafka: bool = Field(default=True, description="Include Kafka in the readiness probe")
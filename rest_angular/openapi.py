@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from time import time
+
+import fastapi
+import lelab_common
+import pydantic
+from fastapi import FastAPI, Request, Response
+from lelab_common import dedupe_openapi_responses
+from starlette.routing import Route
+
+from .static_files import REVALIDATE_CACHE_CONTROL, StaticAsset, build_asset, serve_asset
+
+logger = logging.getLogger(__name__)
+
+
+def _source_fingerprint(app: FastAPI) -> str:
+    """
+    Fingerprint of everything the schema is generated from, used to validate the disk cache.
+
+    Besides the sources and library versions, the route table is included, since settings
+    can add or remove routes (e.g. the profiling routes) without changing any source file.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{fastapi.__version__}:{pydantic.VERSION}".encode())
+    for package_file in (__file__, lelab_common.__file__):
+        for path in sorted(Path(package_file).parent.rglob("*.py")):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    for route in app.routes:
+        if isinstance(route, Route):
+            digest.update(f"{route.path}:{sorted(route.methods or ())}:{route.name}:{route.include_in_schema}".encode())
+    return digest.hexdigest()
+
+
+class CachedOpenAPI:
+    """
+    OpenAPI document generated once and served from memory.
+
+    The schema is generated with shared error responses moved to ``components/responses``,
+    serialized once, and served with an ETag and precompressed variants. With a cache path,
+    the serialized document is also written to disk and reused by later boots as long as
+    the application sources, routes and FastAPI/Pydantic versions are unchanged.
+    """
+
+    def __init__(self, app: FastAPI, cache_path: Path | None = None):
+        self.app = app
+        self.cache_path = cache_path
+        self._asset: StaticAsset | None = None
+
+    def build(self) -> StaticAsset:
+        """Generate or load the document and precompute its encoded variants."""
+        fingerprint = _source_fingerprint(self.app) if self.cache_path is not None else ""
+        content = self._read_cache(fingerprint)
+        if content is None:
+            schema = dedupe_openapi_responses(self.app.openapi())
+            content = json.dumps(schema, ensure_ascii=False, separators=(",", ":")).encode()
+            self._write_cache(fingerprint, content)
+
+        self._asset = build_asset(content, "application/json", REVALIDATE_CACHE_CONTROL, time())
+        return self._asset
+
+    async def endpoint(self, request: Request) -> Response:
+        # Built at startup; apps used without lifespan (tests) build on first request
+        asset = self._asset or self.build()
+        return serve_asset(request, asset)
+
+    def _read_cache(self, fingerprint: str) -> bytes | None:
+        if self.cache_path is None or not self.cache_path.is_file():
+            return None
+        try:
+            cached_fingerprint, _, content = self.cache_path.read_bytes().partition(b"\n")
+        except OSError as e:
+            logger.warning(f"Failed to read OpenAPI cache {self.cache_path}: {e}")
+            return None
+        if cached_fingerprint.decode() != fingerprint:
+            return None
+        return content
+
+    def _write_cache(self, fingerprint: str, content: bytes) -> None:
+        if self.cache_path is None:
+            return
+        temporary_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path.write_bytes(fingerprint.encode() + b"\n" + content)
+            temporary_path.replace(self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write OpenAPI cache {self.cache_path}: {e}")
+
+
+def install_cached_openapi(app: FastAPI, cache_path: Path | None = None) -> CachedOpenAPI:
+    """
+    Replace FastAPI's lazily generated OpenAPI route with a cached document.
+
+    The route keeps its path, name and position, so it still takes precedence over the
+    SPA catch-all route registered after it.
+
+    :param app: application with OpenAPI enabled.
+    :param cache_path: optional file the serialized document is cached in between boots.
+    :return: the cached document, call ``build`` at startup.
+    """
+    cached_openapi = CachedOpenAPI(app, cache_path)
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, Route) and route.name == "openapi":
+            app.router.routes[index] = Route(
+                route.path, cached_openapi.endpoint, methods=["GET"], name="openapi", include_in_schema=False
+            )
+            break
+    return cached_openapi
@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from lelab_common import accepted_encodings
+from starlette import status
+
+try:
+    import brotli  # pyright: ignore[reportMissingImports]
+except ImportError:  # Brotli variants are optional, see the ``compression`` extra
+    brotli = None
+
+# Angular output hashing: "main-5KXHVQ3N.js" (esbuild) or "main.1a2b3c4d5e6f7a8b.js" (webpack)
+_HASHED_NAME = re.compile(r"[.-]([0-9A-Z]{8}|[0-9a-f]{16,20})\.[0-9a-z]+$")
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Files are kept in memory up to this size, larger ones are streamed from disk
+MAX_CACHED_SIZE = 8 * 1024 * 1024
+# Files smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+@dataclass(slots=True)
+class StaticAsset:
+    """A static document with its headers and encoded variants precomputed."""
+
+    path: Path | None
+    media_type: str
+    etag: str
+    last_modified: str
+    cache_control: str
+    mtime: float
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    def variant_etag(self, encoding: str) -> str:
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def load_asset(path: Path, cache_control: str) -> StaticAsset:
+    """
+    Read a file and precompute its ETag and compressed variants.
+
+    :param path: file to load.
+    :param cache_control: Cache-Control header value to serve it with.
+    :return: asset ready to be served from memory.
+    """
+    stat = path.stat()
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    asset = StaticAsset(
+        path=path,
+        media_type=media_type,
+        etag=f'"{stat.st_size:x}-{int(stat.st_mtime * 1000):x}"',
+        last_modified=formatdate(stat.st_mtime, usegmt=True),
+        cache_control=cache_control,
+        mtime=stat.st_mtime,
+    )
+    if stat.st_size > MAX_CACHED_SIZE:
+        return asset
+
+    _set_content(asset, path.read_bytes())
+    return asset
+
+
+def build_asset(content: bytes, media_type: str, cache_control: str, mtime: float) -> StaticAsset:
+    """
+    Precompute the ETag and compressed variants of a document generated in memory.
+
+    :param content: document body.
+    :param media_type: content type of the document.
+    :param cache_control: Cache-Control header value to serve it with.
+    :param mtime: timestamp used for Last-Modified.
+    :return: asset ready to be served from memory.
+    """
+    asset = StaticAsset(
+        path=None,
+        media_type=media_type,
+        etag="",
+        last_modified=formatdate(mtime, usegmt=True),
+        cache_control=cache_control,
+        mtime=mtime,
+    )
+    _set_content(asset, content)
+    return asset
+
+
+def _set_content(asset: StaticAsset, content: bytes) -> None:
+    asset.etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    asset.variants["identity"] = content
+    if len(content) >= MIN_COMPRESS_SIZE and _is_compressible(asset.media_type):
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(gzipped) < len(content):
+            asset.variants["gzip"] = gzipped
+        if brotli is not None:
+            brotlied = brotli.compress(content, quality=11)
+            if len(brotlied) < len(content):
+                asset.variants["br"] = brotlied
+
+
+def build_static_manifest(static_dir: Path) -> dict[str, StaticAsset]:
+    """
+    Load every file below the static directory, keyed by its URL path relative to it.
+
+    Hashed Angular bundle files get an immutable Cache-Control, everything else must
+    be revalidated.
+
+    :param static_dir: directory with the Angular build output.
+    :return: manifest of static assets.
+    """
+    manifest: dict[str, StaticAsset] = {}
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        cache_control = IMMUTABLE_CACHE_CONTROL if _HASHED_NAME.search(path.name) else REVALIDATE_CACHE_CONTROL
+        manifest[path.relative_to(static_dir).as_posix()] = load_asset(path, cache_control)
+    return manifest
+
+
+class CachedFile:
+    """
+    A single static manifest entry served on its own, such as the SPA ``index.html``.
+
+    The asset stays in the manifest, so the file is cached once whether it is requested
+    directly or as the SPA fallback. With ``reload`` enabled (development), the file is
+    stat-ed on access and the manifest entry is reloaded when its modification time
+    changes, so a rebuilt frontend is picked up without a restart. Otherwise the file is
+    never touched again after startup.
+    """
+
+    def __init__(self, manifest: dict[str, StaticAsset], key: str, reload: bool = False):
+        self.manifest = manifest
+        self.key = key
+        self.reload = reload
+
+    @property
+    def asset(self) -> StaticAsset:
+        asset = self.manifest[self.key]
+        if self.reload and asset.path is not None:
+            try:
+                mtime = asset.path.stat().st_mtime
+            except FileNotFoundError:
+                # Mid-rebuild, keep serving the previous version
+                return asset
+            if mtime != asset.mtime:
+                asset = self.manifest[self.key] = load_asset(asset.path, asset.cache_control)
+        return asset
+
+
+def _none_match(if_none_match: str, asset: StaticAsset) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    etags = {asset.variant_etag(encoding) for encoding in asset.variants} | {asset.etag}
+    return any(tag.strip().removeprefix("W/") in etags for tag in if_none_match.split(","))
+
+
+def serve_asset(request: Request, asset: StaticAsset) -> Response:
+    """
+    Serve a static asset from memory, negotiating the content encoding.
+
+    :param request: current request.
+    :param asset: asset to serve.
+    :return: 304 when the client copy is current, otherwise the best encoded variant.
+    """
+    headers = {
+        "Cache-Control": asset.cache_control,
+        "Last-Modified": asset.last_modified,
+        "Vary": "Accept-Encoding",
+    }
+
+    if not asset.variants and asset.path is not None:
+        return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+
+    encoding = "identity"
+    if len(asset.variants) > 1:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for candidate in ("br", "gzip"):
+            if candidate in asset.variants and candidate in accepted:
+                encoding = candidate
+                break
+    headers["ETag"] = asset.variant_etag(encoding)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _none_match(if_none_match, asset):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
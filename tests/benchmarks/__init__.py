@@ -0,0 +1 @@
+"""Micro-benchmarks, run manually with ``python -m tests.benchmarks.<name>``."""
@@ -0,0 +1,81 @@
+"""
+Compare the ISO8601 log formatters against the previous per-record implementation.
+
+Run with ``python -m tests.benchmarks.bench_log_formatter [records]`` (default: one million).
+Records are spread over a few hundred distinct seconds, like a busy service emitting
+thousands of lines per second.
+"""
+
+import logging
+import os
+import sys
+from datetime import datetime
+from time import perf_counter, time
+from zoneinfo import ZoneInfo
+
+from lelab_common.logger import ColoredISO8601Formatter, ISO8601Formatter
+
+FORMAT = "%(levelname)s:\t%(asctime)s\t[%(name)s]\t%(message)s"
+
+
+class LegacyISO8601Formatter(logging.Formatter):
+    """The formatter as it was before timezone and per-second caching."""
+
+    def formatTime(self, record, datefmt=None):
+        tz_name = os.environ.get("TZ", "UTC")
+        dt = datetime.fromtimestamp(record.created, tz=ZoneInfo(tz_name))
+        return dt.isoformat()
+
+
+class LegacyColoredISO8601Formatter(LegacyISO8601Formatter):
+    COLORS = ColoredISO8601Formatter.COLORS
+    RESET = ColoredISO8601Formatter.RESET
+
+    def format(self, record):
+        original_levelname = record.levelname
+        color = self.COLORS.get(record.levelname, "")
+        if color:
+            record.levelname = f"{color}{record.levelname}{self.RESET}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = original_levelname
+
+
+def _records(count: int) -> list[logging.LogRecord]:
+    start = time()
+    levels = (logging.INFO, logging.INFO, logging.INFO, logging.WARNING, logging.ERROR)
+    records = []
+    for i in range(count):
+        record = logging.LogRecord("bench", levels[i % len(levels)], __file__, 0, "request %d done", (i,), None)
+        record.created = start + i / 5000
+        record.msecs = (record.created - int(record.created)) * 1000
+        records.append(record)
+    return records
+
+
+def _bench(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    fmt = formatter.format
+    start = perf_counter()
+    for record in records:
+        fmt(record)
+    return perf_counter() - start
+
+
+def main(count: int) -> None:
+    records = _records(count)
+    pairs = (
+        ("ISO8601Formatter", LegacyISO8601Formatter(FORMAT), ISO8601Formatter(FORMAT)),
+        ("ColoredISO8601Formatter", LegacyColoredISO8601Formatter(FORMAT), ColoredISO8601Formatter(FORMAT)),
+    )
+    for name, legacy, current in pairs:
+        legacy_seconds = _bench(legacy, records)
+        current_seconds = _bench(current, records)
+        print(
+            f"{name:<24} legacy {legacy_seconds:6.2f}s  current {current_seconds:6.2f}s"
+            f"  speedup x{legacy_seconds / current_seconds:4.1f}  ({count:,} records)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
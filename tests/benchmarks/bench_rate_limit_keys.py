@@ -0,0 +1,84 @@
+"""
+Compare the Redis memory taken by rate limit counters with the former and the compact key layout.
+
+Run with ``python -m tests.benchmarks.bench_rate_limit_keys [clients] [redis url]``
+(default: one million clients, ``redis://localhost:6379/15``). Every client gets one
+counter for the same route template, like a fixed window in flight. The target database
+must be empty and is flushed after each layout. Without a reachable Redis, only the key
+sizes are compared.
+"""
+
+import asyncio
+import sys
+import uuid
+from time import time
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError
+from rest_angular.modules.plans.keys import counter_key
+
+PATH = "api_v1_tenants_{tenant_id}_users_{user_id}_orders"
+PERIOD = 3600
+BATCH = 10_000
+
+
+def legacy_key(client: str, path: str, period: int, now: int) -> str:
+    """The key layout before the compact encoding."""
+    return f"ratelimit:{client}:{path}:{period}:{now - now % period}"
+
+
+async def _used_memory(redis: Redis) -> int:
+    info = await redis.info("memory")
+    return int(info["used_memory"])
+
+
+async def _load(redis: Redis, keys: list[str]) -> int:
+    """Write one counter per key and return the memory it took."""
+    await redis.flushdb()
+    before = await _used_memory(redis)
+    for start in range(0, len(keys), BATCH):
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys[start : start + BATCH]:
+                pipe.incr(key)
+                pipe.expire(key, PERIOD, nx=True)
+            await pipe.execute()
+    used = await _used_memory(redis) - before
+    await redis.flushdb()
+    return used
+
+
+async def main(clients: int, redis_url: str) -> None:
+    now = int(time())
+    client_ids = [str(uuid.uuid4()) for _ in range(clients)]
+    layouts = {
+        "legacy": [legacy_key(client, PATH, PERIOD, now) for client in client_ids],
+        "compact": [counter_key(client, PATH, PERIOD, now) for client in client_ids],
+    }
+
+    print(f"{clients} clients, path {PATH!r}")
+    for name, keys in layouts.items():
+        print(f"{name:<8} key: {keys[0]} ({len(keys[0])} bytes)")
+    for name, keys in layouts.items():
+        print(f"{name:<8} key bytes: {sum(map(len, keys)) / 2**20:8.1f} MiB")
+
+    redis = Redis.from_url(redis_url)
+    try:
+        if await redis.dbsize():
+            print(f"{redis_url} is not empty, skipping the Redis measurement")
+            return
+        for name, keys in layouts.items():
+            used = await _load(redis, keys)
+            print(f"{name:<8} Redis used_memory: {used / 2**20:8.1f} MiB ({used / clients:6.1f} bytes/client)")
+    except ConnectionError as e:
+        print(f"Redis not reachable at {redis_url}, skipping the Redis measurement: {e}")
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+            sys.argv[2] if len(sys.argv) > 2 else "redis://localhost:6379/15",
+        )
+    )
@@ -0,0 +1,71 @@
+"""
+Measure the per-request overhead added by ``RequestTraceMiddleware``.
+
+Run with ``python -m tests.benchmarks.bench_request_trace_middleware [requests]``.
+The middleware is exercised directly through ASGI calls (no HTTP server), once with
+INFO logging filtered out and once with INFO logging enabled into a ``NullHandler``.
+"""
+
+import asyncio
+import logging
+import sys
+from time import perf_counter_ns
+
+from lelab_common import RequestTraceMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+_SCOPE_HEADERS = [
+    (b"host", b"localhost:8000"),
+    (b"user-agent", b"bench/1.0"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, br"),
+    (b"authorization", b"Bearer x.y.z"),
+]
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    return None
+
+
+async def _run(app, requests: int) -> float:
+    """Return the mean time per request in microseconds."""
+    start = perf_counter_ns()
+    for _ in range(requests):
+        scope: Scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/plans/tiers",
+            "headers": list(_SCOPE_HEADERS),
+        }
+        await app(scope, _receive, _send)
+    return (perf_counter_ns() - start) / requests / 1000
+
+
+async def main(requests: int) -> None:
+    middleware_logger = logging.getLogger("lelab_common.request_trace_middleware")
+    middleware_logger.propagate = False
+    middleware_logger.addHandler(logging.NullHandler())
+
+    baseline = await _run(_endpoint, requests)
+    print(f"bare endpoint:            {baseline:8.2f} us/request")
+
+    for level in (logging.WARNING, logging.INFO):
+        middleware_logger.setLevel(level)
+        traced = await _run(RequestTraceMiddleware(_endpoint), requests)
+        print(
+            f"middleware ({logging.getLevelName(level):<7}):     {traced:8.2f} us/request"
+            f"  (overhead {traced - baseline:6.2f} us)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
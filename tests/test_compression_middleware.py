@@ -0,0 +1,96 @@
+import gzip
+import zlib
+
+import pytest
+from lelab_common import CompressionMiddleware, accepted_encodings
+from starlette.types import Message, Receive, Scope, Send
+
+_LARGE_BODY = b'{"items": [' + b'{"id": 1, "name": "tier"},' * 200 + b"]}"
+
+
+def _endpoint(
+    body: bytes, content_type: bytes = b"application/json", extra_headers: list[tuple[bytes, bytes]] | None = None
+):
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers + (extra_headers or [])})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+async def _streaming_endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    for _ in range(3):
+        await send({"type": "http.response.body", "body": b"chunk " * 50, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _call(app: CompressionMiddleware, accept_encoding: bytes = b"gzip") -> list[Message]:
+    scope: Scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding)]}
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.mark.anyio
+async def test_compresses_large_json() -> None:
+    """
+    Checks that large responses are gzip compressed with an updated Content-Length.
+    """
+    messages = await _call(CompressionMiddleware(_endpoint(_LARGE_BODY)))
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert int(headers[b"content-length"]) == len(messages[1]["body"])
+    assert gzip.decompress(messages[1]["body"]) == _LARGE_BODY
+
+
+@pytest.mark.anyio
+async def test_skips_small_encoded_and_unlisted_responses() -> None:
+    """
+    Checks that small, already encoded and non-allowlisted responses pass through.
+    """
+    for app in (
+        CompressionMiddleware(_endpoint(b"{}")),
+        CompressionMiddleware(_endpoint(_LARGE_BODY, extra_headers=[(b"content-encoding", b"br")])),
+        CompressionMiddleware(_endpoint(_LARGE_BODY, content_type=b"image/png")),
+    ):
+        messages = await _call(app)
+        assert b"gzip" not in dict(messages[0]["headers"]).get(b"content-encoding", b"")
+
+    messages = await _call(CompressionMiddleware(_endpoint(_LARGE_BODY)), accept_encoding=b"identity")
+    assert messages[1]["body"] == _LARGE_BODY
+
+
+@pytest.mark.anyio
+async def test_compresses_streaming_chunks() -> None:
+    """
+    Checks that streamed chunks are compressed and flushed individually.
+    """
+    messages = await _call(CompressionMiddleware(_streaming_endpoint))
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    decompressor = zlib.decompressobj(31)
+    # Each chunk is decodable as soon as it arrives
+    assert decompressor.decompress(messages[1]["body"]) == b"chunk " * 50
+    body = b"".join(message["body"] for message in messages[2:])
+    assert decompressor.decompress(body) == b"chunk " * 100
+
+
+def test_accepted_encodings() -> None:
+    """
+    Checks that Accept-Encoding parsing drops refused and malformed codings.
+    """
+    assert accepted_encodings(" BR;q=1.0, gzip , zstd;q=0, deflate;q=x, identity;q=0.5") == {"br", "gzip", "identity"}
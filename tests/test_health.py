@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from rest_angular.config import settings
+from rest_angular.modules.system.health import HealthChecker, ProbeResult
+
+
+@pytest.mark.anyio
+async def test_probe_results_cached() -> None:
+    """
+    Checks that concurrent and repeated readiness checks share one probe run.
+    """
+    calls = 0
+
+    async def probe() -> ProbeResult:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ProbeResult(healthy=True, latency_ms=0.0)
+
+    checker = HealthChecker(settings)
+    checker._probes = {"fake": probe}
+
+    first, second = await asyncio.gather(checker.check(), checker.check())
+    third = await checker.check()
+
+    assert calls == 1
+    assert first is second is third
+    assert checker.is_ready(first)
+
+
+@pytest.mark.anyio
+async def test_probe_timeout_and_saturation() -> None:
+    """
+    Checks that slow probes are reported down and saturated pools make the app not ready.
+    """
+
+    async def slow_probe() -> ProbeResult:
+        await asyncio.sleep(10)
+        return ProbeResult(healthy=True, latency_ms=0.0)
+
+    async def saturated_probe() -> ProbeResult:
+        return ProbeResult(healthy=True, latency_ms=0.0, pool={"saturation": 1.0})
+
+    checker = HealthChecker(settings)
+    checker.timeout = 0.01
+    checker._probes = {"slow": slow_probe}
+    results = await checker.check()
+    assert results["slow"].to_dict()["status"] == "down"
+    assert results["slow"].error == "timeout"
+    assert not checker.is_ready(results)
+
+    checker = HealthChecker(settings)
+    checker._probes = {"saturated": saturated_probe}
+    assert not checker.is_ready(await checker.check())
+
+
+@pytest.mark.anyio
+async def test_probe_error_details_not_exposed(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Checks that a failing probe reports a generic error and only logs the exception.
+
+    :param caplog: log capture fixture.
+    """
+
+    async def failing_probe() -> ProbeResult:
+        raise ConnectionError("Error connecting to db.internal:5432")
+
+    checker = HealthChecker(settings)
+    checker._probes = {"database": failing_probe}
+    result = (await checker.check())["database"]
+
+    assert result.to_dict()["error"] == "unavailable"
+    assert "db.internal" not in str(result.to_dict())
+    assert any("db.internal" in record.getMessage() for record in caplog.records)
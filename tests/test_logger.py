@@ -0,0 +1,111 @@
+import json
+import logging
+import queue
+import threading
+from datetime import UTC, datetime
+
+from lelab_common.logger import (
+    BoundedQueueHandler,
+    BoundedQueueListener,
+    ColoredISO8601Formatter,
+    ISO8601Formatter,
+    JSONFormatter,
+    TraceContextFilter,
+)
+from lelab_common.request_trace_middleware import current_trace_id
+
+
+def test_bounded_queue_handler_drops_when_full() -> None:
+    """
+    Checks that the drop policy never blocks and counts records that did not fit in the queue.
+    """
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, policy="drop")
+    logger = logging.getLogger("tests.bounded_queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+    assert log_queue.get_nowait().getMessage() == "record 0"
+
+
+def test_bounded_queue_listener_stops_with_full_queue() -> None:
+    """
+    Checks that the listener stops and flushes every record while its queue is full.
+    """
+    handling = threading.Event()
+    release = threading.Event()
+    handled: list[str] = []
+
+    class SlowHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            handling.set()
+            release.wait(timeout=5)
+            handled.append(record.getMessage())
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    listener = BoundedQueueListener(log_queue, SlowHandler())
+    listener.start()
+    log_queue.put_nowait(logging.makeLogRecord({"msg": "record 0"}))
+    assert handling.wait(timeout=5)
+    for i in (1, 2):
+        log_queue.put_nowait(logging.makeLogRecord({"msg": f"record {i}"}))
+    assert log_queue.full()
+
+    threading.Timer(0.05, release.set).start()
+    listener.stop()
+
+    assert listener._thread is None
+    assert handled == ["record 0", "record 1", "record 2"]
+
+
+def test_iso8601_formatter_time(monkeypatch) -> None:
+    """
+    Checks that cached per-second timestamps match a full ISO8601 rendering with milliseconds.
+    """
+    monkeypatch.setenv("TZ", "UTC")
+    formatter = ISO8601Formatter("%(asctime)s")
+    record = logging.makeLogRecord({"msg": "message"})
+
+    for created in (1_700_000_000.0015, 1_700_000_000.9994, 1_700_000_001.25):
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        expected = datetime.fromtimestamp(created, tz=UTC).isoformat(timespec="milliseconds")
+        assert formatter.formatTime(record) == expected
+
+
+def test_colored_formatter_does_not_mutate_record() -> None:
+    """
+    Checks that the colored formatter injects colors without changing the record's level name.
+    """
+    formatter = ColoredISO8601Formatter("%(levelname)s %(message)s")
+    record = logging.makeLogRecord({"msg": "careful", "levelname": "WARNING", "levelno": logging.WARNING})
+
+    assert formatter.format(record) == f"{ColoredISO8601Formatter.COLORS['WARNING']}WARNING\033[0m careful"
+    assert record.levelname == "WARNING"
+
+
+def test_json_formatter_includes_trace_id() -> None:
+    """
+    Checks that JSON lines have a fixed key order and carry the request trace ID.
+    """
+    formatter = JSONFormatter()
+    record = logging.makeLogRecord({"name": "tests", "msg": "user %s", "args": ("42",), "levelname": "INFO"})
+
+    token = current_trace_id.set("4bf92f3577b34da6a3ce929d0e0e4736")
+    try:
+        TraceContextFilter().filter(record)
+    finally:
+        current_trace_id.reset(token)
+
+    payload = json.loads(formatter.format(record))
+    assert list(payload) == ["timestamp", "level", "logger", "message", "trace_id", "span_id"]
+    assert payload["message"] == "user 42"
+    assert payload["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
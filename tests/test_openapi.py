@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from lelab_common import dedupe_openapi_responses
+from rest_angular.app import create_app
+from rest_angular.openapi import CachedOpenAPI
+from starlette import status
+
+
+def test_dedupe_error_responses() -> None:
+    """
+    Checks that repeated error responses are replaced by references to one component.
+    """
+    error = {"description": "Not Found", "content": {"application/json": {"example": {"type": "NotFoundException"}}}}
+    ok = {"description": "Successful Response"}
+    schema = {
+        "paths": {
+            "/a": {"get": {"responses": {"200": dict(ok), "404": dict(error)}}},
+            "/b": {"post": {"responses": {"200": dict(ok), "404": dict(error)}}},
+        }
+    }
+
+    dedupe_openapi_responses(schema)
+
+    ref = {"$ref": "#/components/responses/NotFoundException"}
+    assert schema["paths"]["/a"]["get"]["responses"]["404"] == ref
+    assert schema["paths"]["/b"]["post"]["responses"]["404"] == ref
+    assert schema["paths"]["/a"]["get"]["responses"]["200"] == ok
+    assert schema["components"]["responses"]["NotFoundException"] == error
+
+
+@pytest.mark.anyio
+async def test_cached_openapi_route() -> None:
+    """
+    Checks that the OpenAPI document is served compressed with an ETag and revalidated.
+    """
+    app = create_app()
+    url = app.url_path_for("openapi")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert "responses" in response.json()["components"]
+
+        not_modified = await client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_openapi_disk_cache(tmp_path: Path) -> None:
+    """
+    Checks that a cached document is reused instead of regenerating the schema.
+
+    :param tmp_path: temporary directory for the cache file.
+    """
+    cache_path = tmp_path / "openapi.json"
+    first = CachedOpenAPI(FastAPI(title="first"), cache_path).build()
+    second = CachedOpenAPI(FastAPI(title="second"), cache_path).build()
+
+    assert second.variants["identity"] == first.variants["identity"]
+    assert b'"first"' in second.variants["identity"]
+
+
+def test_openapi_disk_cache_follows_routes(tmp_path: Path) -> None:
+    """
+    Checks that the cached document is regenerated when the route table changes.
+
+    :param tmp_path: temporary directory for the cache file.
+    """
+    cache_path = tmp_path / "openapi.json"
+    CachedOpenAPI(FastAPI(title="first"), cache_path).build()
+
+    app = FastAPI(title="second")
+
+    @app.get("/extra")
+    async def extra() -> dict[str, str]:
+        return {}
+
+    second = CachedOpenAPI(app, cache_path).build()
+
+    assert b'"second"' in second.variants["identity"]
+    assert b'"/extra"' in second.variants["identity"]
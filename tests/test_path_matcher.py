@@ -0,0 +1,22 @@
+from rest_angular.modules.plans.matching import PathMatcher
+
+
+def test_exact_path_before_prefixes() -> None:
+    """
+    Checks that candidates are ordered from the exact path to the shortest prefix.
+    """
+    matcher = PathMatcher(["api_users_{user_id}", "api_*", "api_users_*", "*", "api_items"])
+
+    assert matcher.candidates("api_users_{user_id}") == ("api_users_{user_id}", "api_users_*", "api_*", "*")
+    assert matcher.candidates("api_users") == ("api_*", "*")
+    assert matcher.candidates("health") == ("*",)
+
+
+def test_no_match() -> None:
+    """
+    Checks that routes without a matching path get no candidates.
+    """
+    matcher = PathMatcher(["api_items", "api_users_*"])
+
+    assert matcher.candidates("api_users") == ()
+    assert matcher.candidates("api_items_{item_id}") == ()
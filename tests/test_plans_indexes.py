@@ -0,0 +1,130 @@
+import json
+import uuid
+from typing import Any
+
+import pytest
+from rest_angular.modules.plans.models import RateLimit, TierTarget
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+def _index_names(plan: dict[str, Any]) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def _explain(connection: AsyncConnection, stmt: Select[Any]) -> set[str]:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _index_names(plan[0]["Plan"])
+
+
+async def _seed(connection: AsyncConnection, suffix: str, tiers: int = 50, targets: int = 5000) -> None:
+    """Spread ``targets`` targets, one in ten inactive, with one rate limit each over ``tiers`` tiers."""
+    await connection.execute(
+        text(
+            "INSERT INTO tiers (name, created_at) "
+            "SELECT 'explain-' || :suffix || '-' || n, now() FROM generate_series(1, :tiers) AS n"
+        ),
+        {"suffix": suffix, "tiers": tiers},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO tier_targets (tier_id, target_type, target_id, is_active, created_at) "
+            "SELECT t.id, (ARRAY['U', 'A', 'T'])[n % 3 + 1], :suffix || '-' || n, n % 10 <> 0, now() "
+            "FROM generate_series(1, :targets) AS n "
+            "JOIN tiers AS t ON t.name = 'explain-' || :suffix || '-' || (n % :tiers + 1)"
+        ),
+        {"suffix": suffix, "tiers": tiers, "targets": targets},
+    )
+    await connection.execute(
+        text(
+            'INSERT INTO rate_limits (tier_target_id, name, path, "limit", period, created_at) '
+            "SELECT tt.id, 'explain-' || :suffix || '-' || tt.id, '/api/test-' || tt.id % 20, 10, 60, now() "
+            "FROM tier_targets AS tt WHERE tt.target_id LIKE :suffix || '-%'"
+        ),
+        {"suffix": suffix},
+    )
+
+
+@pytest.mark.anyio
+async def test_plans_lookups_use_indexes(engine: AsyncEngine) -> None:
+    """
+    Checks that the rate limit lookups are planned on the composite, partial and covering indexes.
+
+    The tables are seeded with a few thousand targets over many tiers, so the planner sees
+    realistic selectivities and the index choice does not depend on near-empty statistics.
+
+    :param engine: test database engine.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            tier_id = (
+                await connection.execute(
+                    text("INSERT INTO tiers (name, created_at) VALUES (:name, now()) RETURNING id"),
+                    {"name": f"explain-{suffix}"},
+                )
+            ).scalar_one()
+            tier_target_id = (
+                await connection.execute(
+                    text(
+                        "INSERT INTO tier_targets (tier_id, target_type, target_id, is_active, created_at) "
+                        "VALUES (:tier_id, 'U', :target_id, true, now()) RETURNING id"
+                    ),
+                    {"tier_id": tier_id, "target_id": suffix},
+                )
+            ).scalar_one()
+            await connection.execute(
+                text(
+                    'INSERT INTO rate_limits (tier_target_id, name, path, "limit", period, created_at) '
+                    "VALUES (:tier_target_id, :name, '/api/test', 10, 60, now())"
+                ),
+                {"tier_target_id": tier_target_id, "name": f"explain-{suffix}"},
+            )
+            await _seed(connection, suffix)
+            await connection.execute(text("SET LOCAL enable_seqscan = off"))
+            await connection.execute(text("ANALYZE tier_targets"))
+            await connection.execute(text("ANALYZE rate_limits"))
+
+            by_target = select(TierTarget.id).where(
+                TierTarget.target_type == "U", TierTarget.target_id == suffix, TierTarget.is_active == True
+            )
+            assert "ix_tier_targets_active_target" in await _explain(connection, by_target)
+
+            by_tier_target_and_path = select(RateLimit.limit, RateLimit.period).where(
+                RateLimit.tier_target_id == tier_target_id, RateLimit.path == "/api/test"
+            )
+            assert "ix_rate_limits_tier_target_id_path" in await _explain(connection, by_tier_target_and_path)
+
+            by_target_and_path = (
+                select(RateLimit.limit, RateLimit.period)
+                .join(TierTarget)
+                .where(
+                    TierTarget.target_type == "U",
+                    TierTarget.target_id == suffix,
+                    TierTarget.is_active == True,
+                    RateLimit.path == "/api/test",
+                )
+            )
+            assert {"ix_tier_targets_active_target", "ix_rate_limits_tier_target_id_path"} <= await _explain(
+                connection, by_target_and_path
+            )
+
+            by_tier_and_path = (
+                select(RateLimit.limit, RateLimit.period)
+                .join(TierTarget)
+                .where(TierTarget.tier_id == tier_id, RateLimit.path == "/api/test")
+            )
+            assert {"ix_tier_targets_tier_id_target_type", "ix_rate_limits_tier_target_id_path"} <= await _explain(
+                connection, by_tier_and_path
+            )
+        finally:
+            await transaction.rollback()
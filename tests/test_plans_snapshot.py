@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from rest_angular.modules.plans.rules import RateLimitRule
+from rest_angular.modules.plans.snapshot import PolicySnapshotStore
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+
+@pytest.mark.anyio
+async def test_policy_snapshot_refreshes_on_version_change(engine: AsyncEngine) -> None:
+    """
+    Checks that the policy snapshot serves lookups from memory and reloads only when
+    the database policy version changes.
+
+    :param engine: test database engine.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    async with engine.begin() as connection:
+        tier_id = (
+            await connection.execute(
+                text("INSERT INTO tiers (name, created_at) VALUES (:name, now()) RETURNING id"),
+                {"name": f"snapshot-{suffix}"},
+            )
+        ).scalar_one()
+        tier_target_id = (
+            await connection.execute(
+                text(
+                    "INSERT INTO tier_targets (tier_id, target_type, target_id, is_active, created_at) "
+                    "VALUES (:tier_id, 'A', :target_id, true, now()) RETURNING id"
+                ),
+                {"tier_id": tier_id, "target_id": suffix},
+            )
+        ).scalar_one()
+        for path, limit in (("api_snapshot", 10), ("api_*", 5)):
+            await connection.execute(
+                text(
+                    'INSERT INTO rate_limits (tier_target_id, name, path, "limit", period, created_at) '
+                    "VALUES (:tier_target_id, :name, :path, :limit, 60, now())"
+                ),
+                {"tier_target_id": tier_target_id, "name": f"snapshot-{suffix}-{path}", "path": path, "limit": limit},
+            )
+
+    store = PolicySnapshotStore(async_sessionmaker(engine), refresh_interval=60)
+    try:
+        assert await store.refresh()
+        snapshot = store.snapshot
+        assert snapshot is not None
+        assert snapshot.get_by_target("A", suffix, "api_snapshot") == (RateLimitRule(10, 60, path="api_snapshot"),)
+        assert snapshot.get_by_tier(tier_id, "api_snapshot") == (RateLimitRule(10, 60, path="api_snapshot"),)
+        # Routes without an exact rate limit fall back to the prefix rule
+        assert snapshot.get_by_target("A", suffix, "api_users_{user_id}") == (RateLimitRule(5, 60, path="api_*"),)
+        assert snapshot.get_by_target("A", suffix, "health") == ()
+
+        # Unchanged version, the snapshot is kept as is
+        assert not await store.refresh()
+        assert store.snapshot is snapshot
+
+        async with engine.begin() as connection:
+            await connection.execute(
+                text('UPDATE rate_limits SET "limit" = 20 WHERE tier_target_id = :id'), {"id": tier_target_id}
+            )
+            await connection.execute(
+                text("UPDATE tier_targets SET is_active = false WHERE id = :id"), {"id": tier_target_id}
+            )
+
+        assert await store.refresh()
+        assert store.snapshot is not None
+        assert store.snapshot.version > snapshot.version
+        assert store.snapshot.get_by_target("A", suffix, "api_snapshot") == ()
+        assert store.snapshot.get_by_tier(tier_id, "api_snapshot") == (RateLimitRule(20, 60, path="api_snapshot"),)
+        # The previous snapshot is immutable
+        assert snapshot.get_by_target("A", suffix, "api_snapshot") == (RateLimitRule(10, 60, path="api_snapshot"),)
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text("DELETE FROM rate_limits WHERE tier_target_id = :id"), {"id": tier_target_id})
+            await connection.execute(text("DELETE FROM tier_targets WHERE id = :id"), {"id": tier_target_id})
+            await connection.execute(text("DELETE FROM tiers WHERE id = :id"), {"id": tier_id})
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from rest_angular.infra.monitor.loop_monitor import LoopMonitor
+from rest_angular.modules.system.profiler import SamplingProfiler
+
+
+def _busy_function(duration: float) -> None:
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_profiler_collapsed_stacks() -> None:
+    """
+    Checks that samples are aggregated as collapsed stacks ending with the sampled frame.
+    """
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy_function(0.2)
+    collapsed = profiler.stop()
+
+    assert profiler.samples > 0
+    lines = collapsed.splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+    assert any("_busy_function" in line.rsplit(" ", 1)[0].split(";")[-1] for line in lines)
+
+
+def test_profiler_finishes_after_max_duration() -> None:
+    """
+    Checks that a session past its maximum duration is reported as finished and can be restarted.
+    """
+    profiler = SamplingProfiler(interval=0.001, max_duration=0.05)
+    profiler.start()
+    _busy_function(0.2)
+
+    assert not profiler.running
+    assert profiler.finished
+    assert profiler.samples > 0
+
+    profiler.start()
+    assert profiler.running
+    profiler.stop()
+    assert not profiler.finished
+
+
+@pytest.mark.anyio
+async def test_loop_monitor_captures_slow_callback(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Checks that blocking the event loop is reported with the stack of the blocking code.
+
+    :param caplog: log capture fixture.
+    """
+    caplog.set_level(logging.WARNING, logger="rest_angular.infra.monitor.loop_monitor")
+    monitor = LoopMonitor(interval=0.01, slow_callback_threshold=0.05)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    _busy_function(0.2)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    report = monitor.report()
+    assert report["lag_ms"]["max"] >= 150
+    slow_callback = report["slow_callbacks"][-1]
+    assert slow_callback["duration_ms"] >= 150
+    assert "_busy_function" in slow_callback["stack"]
+    assert any("Event loop blocked" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,270 @@
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from lelab_common import RequestTraceMiddleware, get_configuration
+from redis.asyncio import RedisCluster
+from redis.crc import key_slot
+from redis.exceptions import ConnectionError
+from rest_angular.infra.cache.circuit_breaker import CircuitBreaker
+from rest_angular.modules.plans.dependencies import rate_limiter_by_target_dependency
+from rest_angular.modules.plans.fallback import (
+    FailureMode,
+    LocalRateLimiter,
+    RateLimitFallback,
+    get_rate_limit_fallback,
+)
+from rest_angular.modules.plans.keys import counter_key, path_id, to_base36
+from rest_angular.modules.plans.leases import TokenLeaseCache
+from rest_angular.modules.plans.rules import RateLimitRule
+from rest_angular.modules.plans.service import PlansService, RateLimiter
+from rest_angular.modules.plans.settings import PlansSettings
+
+
+class _NoPolicies:
+    async def resolve_rate_limits_by_target(self, target_type: str, target_id: str, path: str) -> tuple[()]:
+        return ()
+
+
+def test_counter_key_is_compact() -> None:
+    """
+    Checks the compact counter key layout.
+    """
+    now = 1_760_000_000
+    key = counter_key("client", "api_v1_users_{user_id}_orders", 3600, now)
+
+    assert key == f"rl:{{client}}:{path_id('api_v1_users_{user_id}_orders')}:2s0:{to_base36(now // 3600)}"
+    assert len(path_id("api_v1_users_{user_id}_orders")) == 8
+    assert to_base36(0) == "0"
+    assert int(to_base36(now), 36) == now
+
+
+def test_counter_keys_of_a_client_share_a_cluster_slot() -> None:
+    """
+    Checks that all counters of a client hash to one Redis Cluster slot.
+    """
+    now = 1_760_000_000
+    slots = {
+        key_slot(counter_key("client", path, period, now).encode())
+        for path in ("api_items", "api_users_{user_id}", "*")
+        for period in (1, 60, 3600)
+    }
+
+    assert len(slots) == 1
+    assert key_slot(counter_key("other", "api_items", 1, now).encode()) not in slots
+
+
+@pytest.mark.anyio
+async def test_cluster_transactions_stay_in_one_slot() -> None:
+    """
+    Checks that on a cluster only checks of a single client are sent as a transaction.
+    """
+    cluster = RedisCluster(host="localhost", port=7000)
+    try:
+        limiter = RateLimiter(cluster)
+        assert limiter._transactional((RateLimitRule(10, 1), RateLimitRule(100, 60)), "client")
+        assert not limiter._transactional((RateLimitRule(10, 1), RateLimitRule(100, 60, scope="tenant")), "client")
+        assert RateLimiter(FakeRedis())._transactional((RateLimitRule(10, 1, scope="tenant"),), "client")
+    finally:
+        await cluster.aclose()
+
+
+@pytest.mark.anyio
+async def test_most_restrictive_rule_decides() -> None:
+    """
+    Checks that all rules are counted and the rule with the fewest remaining requests
+    is reported while allowed.
+    """
+    limiter = RateLimiter(FakeRedis())
+    rules = (RateLimitRule(5, 1), RateLimitRule(3, 60), RateLimitRule(1000, 86400))
+
+    decision = await limiter.check("client", "/api/items", rules)
+
+    assert not decision.limited
+    assert decision.limit == 3
+    assert decision.remaining == 2
+    assert 0 < decision.reset <= 60
+
+
+@pytest.mark.anyio
+async def test_rejection_counts_against_longer_windows() -> None:
+    """
+    Checks that a request rejected by one rule is still counted by the other rules.
+    """
+    redis = FakeRedis()
+    limiter = RateLimiter(redis)
+    rules = (RateLimitRule(2, 3600), RateLimitRule(100, 86400))
+
+    for _ in range(2):
+        assert not (await limiter.check("client", "/api/items", rules)).limited
+    for _ in range(3):
+        decision = await limiter.check("client", "/api/items", rules)
+        assert decision.limited
+        assert decision.limit == 2
+        assert decision.remaining == 0
+
+    daily = await limiter.check("client", "/api/items", (RateLimitRule(100, 86400),))
+    assert daily.remaining == 100 - 6
+
+
+@pytest.mark.anyio
+async def test_scoped_rule_is_shared_between_clients() -> None:
+    """
+    Checks that a scoped rule enforces an aggregate limit across clients.
+    """
+    limiter = RateLimiter(FakeRedis())
+    tenant_rule = RateLimitRule(2, 60, scope="T:tenant")
+
+    assert not (await limiter.check("first", "/api/items", (RateLimitRule(10, 60), tenant_rule))).limited
+    assert not (await limiter.check("second", "/api/items", (RateLimitRule(10, 60), tenant_rule))).limited
+    assert (await limiter.check("third", "/api/items", (RateLimitRule(10, 60), tenant_rule))).limited
+
+
+@pytest.mark.anyio
+async def test_is_rate_limited_single_rule() -> None:
+    """
+    Checks the single limit shortcut.
+    """
+    limiter = RateLimiter(FakeRedis())
+
+    assert not await limiter.is_rate_limited("client", "/api/items", limit=1, period=60)
+    assert await limiter.is_rate_limited("client", "/api/items", limit=1, period=60)
+
+
+@pytest.mark.anyio
+async def test_leased_tokens_are_spent_locally() -> None:
+    """
+    Checks that with a token lease cache Redis is only incremented once per lease.
+    """
+    redis = FakeRedis()
+    limiter = RateLimiter(redis, TokenLeaseCache(lease_size=10, min_limit=100, max_entries=100))
+    rule = RateLimitRule(100, 3600)
+
+    for _ in range(25):
+        decision = await limiter.check("client", "/api/items", (rule,))
+        assert not decision.limited
+
+    keys = await redis.keys("rl:*")
+    assert len(keys) == 1
+    assert int(await redis.get(keys[0])) == 30
+    assert decision.remaining == 100 - 25
+
+
+@pytest.mark.anyio
+async def test_leases_never_exceed_the_limit() -> None:
+    """
+    Checks that workers leasing from the same counter never allow more than the limit.
+    """
+    redis = FakeRedis()
+    workers = [RateLimiter(redis, TokenLeaseCache(lease_size=7, min_limit=1, max_entries=100)) for _ in range(3)]
+    rule = RateLimitRule(50, 3600)
+
+    allowed = 0
+    for i in range(120):
+        decision = await workers[i % len(workers)].check("client", "/api/items", (rule,))
+        allowed += not decision.limited
+
+    assert allowed <= 50
+    assert allowed > 50 - 3 * 7
+
+
+@pytest.mark.anyio
+async def test_rate_limit_headers() -> None:
+    """
+    Checks that allowed and rejected responses carry the rate limit headers.
+    """
+    redis = FakeRedis()
+    app = FastAPI()
+    app.add_middleware(RequestTraceMiddleware)
+    app.dependency_overrides[get_configuration] = lambda: PlansSettings(default_rate_limit=1, default_rate_period=60)
+    app.dependency_overrides[RateLimiter] = lambda: RateLimiter(redis)
+    app.dependency_overrides[PlansService] = _NoPolicies
+
+    @app.get("/limited/{target_type}/{target_id}", dependencies=[Depends(rate_limiter_by_target_dependency)])
+    async def limited() -> dict[str, str]:
+        return {"status": "ok"}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        allowed = await client.get("/limited/A/app")
+        rejected = await client.get("/limited/A/app")
+
+    assert allowed.status_code == 200
+    assert allowed.headers["ratelimit-limit"] == "1"
+    assert allowed.headers["ratelimit-remaining"] == "0"
+    assert 0 < int(allowed.headers["ratelimit-reset"]) <= 60
+    assert "retry-after" not in allowed.headers
+
+    assert rejected.status_code == 429
+    assert rejected.headers["ratelimit-remaining"] == "0"
+    assert rejected.headers["retry-after"] == rejected.headers["ratelimit-reset"]
+
+    # Counted per route template, not per URL
+    [key] = await redis.keys("rl:*")
+    assert key.decode().startswith(f"rl:{{A:app}}:{path_id('limited_{target_type}_{target_id}')}:")
+
+
+def _fallback(mode: FailureMode) -> RateLimitFallback:
+    return RateLimitFallback(
+        mode=mode,
+        timeout=0.05,
+        breaker=CircuitBreaker("test", failure_threshold=2, reset_timeout=60),
+        local_limiter=LocalRateLimiter(max_entries=100),
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(("mode", "limited"), [("open", False), ("closed", True)])
+async def test_failure_modes(mode: FailureMode, limited: bool) -> None:
+    """
+    Checks that Redis failures are decided by the failure mode instead of raised.
+
+    :param mode: failure mode under test.
+    :param limited: expected decision.
+    """
+    server = FakeServer()
+    server.connected = False
+    limiter = RateLimiter(FakeRedis(server=server), fallback=_fallback(mode))
+
+    decision = await limiter.check("client", "/api/items", (RateLimitRule(10, 60),))
+
+    assert decision.limited is limited
+
+
+@pytest.mark.anyio
+async def test_local_fallback_and_circuit_breaker() -> None:
+    """
+    Checks that the local limiter counts requests while Redis is down and that the
+    circuit opens after consecutive failures.
+    """
+    server = FakeServer()
+    server.connected = False
+    fallback = _fallback("local")
+    limiter = RateLimiter(FakeRedis(server=server), fallback=fallback)
+    rule = RateLimitRule(3, 60)
+
+    decisions = [await limiter.check("client", "/api/items", (rule,)) for _ in range(4)]
+
+    assert [decision.limited for decision in decisions] == [False, False, False, True]
+    assert decisions[-1].headers()["Retry-After"] == str(decisions[-1].reset)
+    assert fallback.breaker.state == "open"
+
+
+@pytest.mark.anyio
+async def test_redis_errors_raise_without_fallback() -> None:
+    """
+    Checks that without a fallback Redis errors reach the caller.
+    """
+    server = FakeServer()
+    server.connected = False
+    limiter = RateLimiter(FakeRedis(server=server))
+
+    with pytest.raises(ConnectionError):
+        await limiter.check("client", "/api/items", (RateLimitRule(10, 60),))
+
+
+def test_redis_errors_raise_by_default() -> None:
+    """
+    Checks that no fallback is configured unless a failure mode is chosen.
+    """
+    assert get_rate_limit_fallback(PlansSettings()) is None
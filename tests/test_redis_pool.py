@@ -0,0 +1,38 @@
+import pytest
+from rest_angular.config import settings
+from rest_angular.infra.cache import redis
+from rest_angular.infra.cache.settings import RedisSettings
+
+
+@pytest.mark.anyio
+async def test_clients_share_pool() -> None:
+    """
+    Checks that redis clients handed to requests reuse one connection pool.
+    """
+    first = await redis.get_redis(settings)
+    second = await redis.get_redis(settings)
+    try:
+        assert first.connection_pool is second.connection_pool
+        assert first.connection_pool is redis.get_redis_pool(settings)
+    finally:
+        await first.aclose()
+        await second.aclose()
+        await redis.close_redis_pool()
+
+    assert redis._redis_pool is None
+
+
+@pytest.mark.anyio
+async def test_cluster_client_is_shared() -> None:
+    """
+    Checks that in cluster mode every request gets the same cluster client.
+    """
+    cluster_settings = RedisSettings(redis_cluster=True, redis_max_connections=8)
+    first = await redis.get_redis(cluster_settings)
+    try:
+        assert first is await redis.get_redis(cluster_settings)
+        assert first is redis.get_redis_cluster(cluster_settings)
+    finally:
+        await redis.close_redis_pool()
+
+    assert redis._redis_cluster is None
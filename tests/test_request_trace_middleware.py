@@ -0,0 +1,116 @@
+import logging
+from typing import Any
+
+import pytest
+from lelab_common import AccessLogAggregator, NotFoundException, RequestTraceMiddleware
+from starlette.types import Message, Receive, Scope, Send
+
+
+async def _ok_endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _failing_endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    raise NotFoundException()
+
+
+async def _call(app: Any, headers: list[tuple[bytes, bytes]] | None = None) -> tuple[Scope, list[Message]]:
+    scope: Scope = {"type": "http", "method": "GET", "path": "/api/test", "headers": headers or []}
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await RequestTraceMiddleware(app)(scope, receive, send)
+    return scope, messages
+
+
+@pytest.mark.anyio
+async def test_trace_headers_added() -> None:
+    """
+    Checks that trace and timing headers are appended to the response start message.
+    """
+    scope, messages = await _call(_ok_endpoint)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-trace-id"].decode() == scope["trace_id"]
+    assert len(scope["trace_id"]) == 32
+    assert int(headers[b"x-process-time"]) >= 0
+    assert headers[b"content-type"] == b"text/plain"
+
+
+@pytest.mark.anyio
+async def test_incoming_trace_id_is_reused() -> None:
+    """
+    Checks that a trace ID supplied by the caller is propagated instead of generating a new one.
+    """
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    scope, messages = await _call(_ok_endpoint, headers=[(b"x-trace-id", trace_id.encode())])
+
+    assert scope["trace_id"] == trace_id
+    assert dict(messages[0]["headers"])[b"x-trace-id"] == trace_id.encode()
+
+
+@pytest.mark.anyio
+async def test_empty_trace_id_header_is_replaced() -> None:
+    """
+    Checks that an empty trace ID header gets a generated trace ID.
+    """
+    scope, messages = await _call(_ok_endpoint, headers=[(b"x-trace-id", b"")])
+
+    assert len(scope["trace_id"]) == 32
+    assert dict(messages[0]["headers"])[b"x-trace-id"] == scope["trace_id"].encode()
+
+
+@pytest.mark.anyio
+async def test_application_exception_is_rendered() -> None:
+    """
+    Checks that application exceptions are converted to JSON error responses carrying the trace ID.
+    """
+    scope, messages = await _call(_failing_endpoint)
+
+    assert messages[0]["status"] == 404
+    assert dict(messages[0]["headers"])[b"x-trace-id"] == scope["trace_id"].encode()
+
+
+@pytest.mark.anyio
+async def test_successful_requests_are_sampled(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Checks that only one in N successful requests is logged when sampling is enabled.
+    """
+    middleware = RequestTraceMiddleware(_ok_endpoint, log_sample_rate=5)
+    scope: Scope = {"type": "http", "method": "GET", "path": "/api/test", "headers": []}
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    with caplog.at_level(logging.INFO, logger="lelab_common.request_trace_middleware"):
+        for _ in range(10):
+            await middleware(dict(scope), receive, send)
+
+    assert len([r for r in caplog.records if r.getMessage().startswith("Request completed")]) == 2
+    assert not [r for r in caplog.records if r.getMessage().startswith("Request started")]
+
+
+def test_access_log_aggregator_summary(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Checks that the aggregator logs one summary line per route and status.
+    """
+    aggregator = AccessLogAggregator(interval=3600)
+    for duration in range(1, 101):
+        aggregator.record("GET", "/api/plans/tiers", 200, duration)
+    aggregator.record("GET", "/api/plans/tiers", 404, 3)
+
+    with caplog.at_level(logging.INFO, logger="lelab_common.access_log"):
+        aggregator.flush()
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 2
+    assert "count: 100, p50: 50ms, p95: 95ms, p99: 99ms" in messages[0]
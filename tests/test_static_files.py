@@ -0,0 +1,84 @@
+import gzip
+import os
+from pathlib import Path
+
+from rest_angular.static_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CachedFile,
+    build_static_manifest,
+    serve_asset,
+)
+from starlette.requests import Request
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def test_manifest_cache_control(tmp_path: Path) -> None:
+    """
+    Checks that hashed bundle files are immutable and other files must be revalidated.
+
+    :param tmp_path: temporary static directory.
+    """
+    (tmp_path / "main-5KXHVQ3N.js").write_text("console.log(1);")
+    (tmp_path / "favicon.ico").write_bytes(b"\x00\x01")
+    (tmp_path / "media").mkdir()
+    (tmp_path / "media" / "logo.1a2b3c4d5e6f7a8b.svg").write_text("<svg/>")
+
+    manifest = build_static_manifest(tmp_path)
+
+    assert manifest["main-5KXHVQ3N.js"].cache_control == IMMUTABLE_CACHE_CONTROL
+    assert manifest["media/logo.1a2b3c4d5e6f7a8b.svg"].cache_control == IMMUTABLE_CACHE_CONTROL
+    assert manifest["favicon.ico"].cache_control == REVALIDATE_CACHE_CONTROL
+
+
+def test_serve_asset_negotiation(tmp_path: Path) -> None:
+    """
+    Checks Accept-Encoding negotiation and conditional requests.
+
+    :param tmp_path: temporary static directory.
+    """
+    content = b"body { color: red; }\n" * 200
+    (tmp_path / "styles-ABCDEFGH.css").write_bytes(content)
+    asset = build_static_manifest(tmp_path)["styles-ABCDEFGH.css"]
+
+    plain = serve_asset(_request(), asset)
+    assert plain.body == content
+    assert "content-encoding" not in plain.headers
+
+    gzipped = serve_asset(_request({"Accept-Encoding": "gzip;q=1, identity;q=0.5"}), asset)
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(gzipped.body) == content
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+
+    refused = serve_asset(_request({"Accept-Encoding": "gzip;q=0"}), asset)
+    assert "content-encoding" not in refused.headers
+
+    not_modified = serve_asset(_request({"If-None-Match": plain.headers["etag"]}), asset)
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+
+
+def test_cached_file_reload(tmp_path: Path) -> None:
+    """
+    Checks that a cached file is reloaded on change only when reload is enabled.
+
+    :param tmp_path: temporary static directory.
+    """
+    index_file = tmp_path / "index.html"
+    index_file.write_text("<html>v1</html>")
+    cached = CachedFile(build_static_manifest(tmp_path), "index.html")
+    manifest = build_static_manifest(tmp_path)
+    reloading = CachedFile(manifest, "index.html", reload=True)
+
+    index_file.write_text("<html>version 2</html>")
+    os.utime(index_file, (1, 1))
+
+    assert cached.asset.variants["identity"] == b"<html>v1</html>"
+    assert reloading.asset.variants["identity"] == b"<html>version 2</html>"
+    assert reloading.asset.cache_control == REVALIDATE_CACHE_CONTROL
+    # The manifest entry is reloaded in place, direct requests get the same copy
+    assert manifest["index.html"] is reloading.asset
@@ -0,0 +1,65 @@
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+from rest_angular.infra.monitor.sampling import ErrorSamplingSpanProcessor, RecordUnsampledSampler
+
+
+def _provider(exporter: InMemorySpanExporter, ratio: float) -> TracerProvider:
+    provider = TracerProvider(sampler=RecordUnsampledSampler(ratio))
+    provider.add_span_processor(ErrorSamplingSpanProcessor(exporter, schedule_delay_millis=60000))
+    return provider
+
+
+def test_unsampled_spans_are_not_exported() -> None:
+    """
+    Checks that spans outside the sampled ratio are recorded but never exported.
+    """
+    exporter = InMemorySpanExporter()
+    provider = _provider(exporter, 0.0)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("parent") as parent:
+        assert parent.is_recording()
+        assert not parent.get_span_context().trace_flags.sampled
+        with tracer.start_as_current_span("child"):
+            pass
+
+    provider.force_flush()
+    assert exporter.get_finished_spans() == ()
+    provider.shutdown()
+
+
+def test_errored_spans_are_exported() -> None:
+    """
+    Checks that an unsampled span ending with an error is exported as sampled.
+    """
+    exporter = InMemorySpanExporter()
+    provider = _provider(exporter, 0.0)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("parent"):
+        with tracer.start_as_current_span("failing") as span:
+            span.set_status(Status(StatusCode.ERROR))
+
+    provider.force_flush()
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["failing"]
+    assert spans[0].context.trace_flags.sampled
+    provider.shutdown()
+
+
+def test_sampled_spans_are_exported() -> None:
+    """
+    Checks that sampled traces are exported in full.
+    """
+    exporter = InMemorySpanExporter()
+    provider = _provider(exporter, 1.0)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("parent"):
+        with tracer.start_as_current_span("child"):
+            pass
+
+    provider.force_flush()
+    assert {span.name for span in exporter.get_finished_spans()} == {"parent", "child"}
+    provider.shutdown()